@@ -9,19 +9,77 @@ import time
 import json
 import logging
 import requests
-from typing import Dict, List, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 from agents.base_agent_runner import AgentRunner
+from agents.common.rag_client import to_documents
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# (step_type, step_data) of a step a worker thread leaves for run_task to record
+PendingStep = Tuple[str, Dict[str, Any]]
+
+# Static planning, conversation and report text; only the company name varies per task
+_PLAN_TEMPLATE = (
+    "1. Gather comprehensive overview of {company}",
+    "2. Collect recent news and press releases",
+    "3. Research product portfolio and market positioning",
+    "4. Analyze financial performance and future outlook",
+    "5. Synthesize information into a detailed report"
+)
+
+_RESEARCHER_SUMMARY_TEMPLATE = "I've gathered comprehensive information about {company}. The company appears to be a significant player in its industry with strong market presence."
+_ANALYST_NEWS_TEMPLATE = "Based on the news, {company} is making strategic moves to expand its market reach. Their product portfolio shows innovation and market leadership."
+
+_FINANCIAL_EXPERT_MSG = {
+    "agent": "financial_expert",
+    "message": "The financial data indicates strong performance with consistent growth. Their profit margins are healthy and they appear to be financially stable."
+}
+_RESEARCHER_QUESTION_MSG = {
+    "agent": "researcher",
+    "message": "What are the key strengths and potential risks we should highlight in our report?"
+}
+_ANALYST_SUMMARY_MSG = {
+    "agent": "analyst",
+    "message": "Key strengths include market leadership, innovative products, and strategic growth initiatives. Potential risks might include market competition and regulatory challenges."
+}
+
+_REPORT_TEMPLATE = """# {company} Research Report
+
+{company_text}
+
+{news_text}
+
+{product_text}
+
+{financial_text}
+
+Our multi-agent analysis of {company} reveals a strong market position with innovative products and solid financial performance. The company has demonstrated strategic vision through recent initiatives and maintains a competitive edge in its industry. Based on our comprehensive assessment, {company} shows promising growth potential and resilience in its market sector.
+
+- Strong market leadership and brand recognition
+- Innovative product portfolio with consistent updates
+- Robust financial performance with healthy margins
+- Strategic growth initiatives and market expansion
+
+- Competitive market landscape
+- Regulatory challenges in key markets
+- Potential for market disruption from emerging technologies
+"""
+
+_REPORT_SECTIONS = ("Company Overview", "Recent News", "Product Portfolio", "Financial Analysis", "Executive Summary", "Strengths and Opportunities", "Potential Risks")
+
 class AutoGenRunner(AgentRunner):
     """
     Implementation of the AgentRunner for AutoGen.
     
     This agent is tasked with researching a given company using the AutoGen framework.
+    The simulated planning, conversation and reporting delays can be disabled by
+    setting the AGENT_SIMULATE_LATENCY environment variable to 0.
     """
     
     def __init__(self, rag_service_url: str):
@@ -33,6 +91,13 @@ class AutoGenRunner(AgentRunner):
         """
         super().__init__("autogen", rag_service_url)
         
+        # Keep-alive pool sized for the four concurrent aspect queries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8,
+                              max_retries=Retry(total=2, backoff_factor=0.1))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip"
         
     def run_task(self, topic: str) -> Dict[str, Any]:
         """
@@ -49,28 +114,40 @@ class AutoGenRunner(AgentRunner):
         
         self._simulate_research_planning(topic)
         
-        company_info = self._query_rag_service(topic, "company overview")
+        # The four aspect queries are independent, so overlap their round trips
+        aspects = ("company overview", "recent news", "product portfolio", "financial analysis")
+        with ThreadPoolExecutor(max_workers=len(aspects)) as executor:
+            fetched = list(executor.map(lambda aspect: self._fetch_rag_results(topic, aspect), aspects))
+        company_info, news_info, product_info, financial_info = (results for results, _ in fetched)
+        company_issue, news_issue, product_issue, financial_issue = (issue for _, issue in fetched)
+        
+        # Each aspect's warning or error step goes right before its rag_query step
+        if company_issue is not None:
+            self._add_step(*company_issue)
         self._add_step("rag_query", {
             "query": f"Company overview for {topic}",
             "results": company_info,
             "usage": "Used to gather general company information"
         })
         
-        news_info = self._query_rag_service(topic, "recent news")
+        if news_issue is not None:
+            self._add_step(*news_issue)
         self._add_step("rag_query", {
             "query": f"Recent news about {topic}",
             "results": news_info,
             "usage": "Used to gather recent news about the company"
         })
         
-        product_info = self._query_rag_service(topic, "product portfolio")
+        if product_issue is not None:
+            self._add_step(*product_issue)
         self._add_step("rag_query", {
             "query": f"Product portfolio of {topic}",
             "results": product_info,
             "usage": "Used to gather information about company products"
         })
         
-        financial_info = self._query_rag_service(topic, "financial analysis")
+        if financial_issue is not None:
+            self._add_step(*financial_issue)
         self._add_step("rag_query", {
             "query": f"Financial analysis of {topic}",
             "results": financial_info,
@@ -98,18 +175,13 @@ class AutoGenRunner(AgentRunner):
         
         self._add_step("planning", {
             "thought": f"Planning research approach for {company}",
-            "plan": [
-                f"1. Gather comprehensive overview of {company}",
-                f"2. Collect recent news and press releases",
-                f"3. Research product portfolio and market positioning",
-                f"4. Analyze financial performance and future outlook",
-                f"5. Synthesize information into a detailed report"
-            ]
+            "plan": [step.format(company=company) for step in _PLAN_TEMPLATE]
         })
         
         self._update_token_usage(280)
         
-        time.sleep(0.6)
+        if self.simulate_latency:
+            time.sleep(0.6)
     
     def _query_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
         """
@@ -122,28 +194,44 @@ class AutoGenRunner(AgentRunner):
         Returns:
             List of relevant documents
         """
+        results, issue = self._fetch_rag_results(company, aspect)
+        
+        if issue is not None:
+            self._add_step(*issue)
+        
+        return results
+    
+    def _fetch_rag_results(self, company: str, aspect: str) -> Tuple[List[Dict[str, Any]], Optional[PendingStep]]:
+        """
+        Query the RAG service without recording steps, so queries can run in worker threads.
+        
+        Args:
+            company: Company name to research
+            aspect: Specific aspect to research (e.g., "recent news")
+            
+        Returns:
+            Tuple of the relevant documents and the (step_type, step_data) of a
+            warning or error step to record, or None if the query succeeded
+        """
+        issue = None
+        
         try:
             query = f"{company} {aspect}"
             
             # Call RAG service
-            response = requests.get(
+            response = self.session.get(
                 f"{self.rag_service_url}/query",
-                params={"q": query, "top_k": 3}
+                params={"q": query, "top_k": 3},
+                timeout=(1.0, 5.0)
             )
             
             if response.status_code == 200:
                 data = response.json()
                 
-                results = []
-                for result in data.get("results", []):
-                    results.append({
-                        "text": result.get("chunk", ""),
-                        "metadata": result.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    })
+                results = to_documents(data.get("results", []))
                 
                 if not results:
-                    self._add_step("warning", {
+                    issue = ("warning", {
                         "message": f"No results found for query: '{query}'",
                         "action": "Using fallback data for analysis"
                     })
@@ -154,12 +242,12 @@ class AutoGenRunner(AgentRunner):
                 
                 self._update_token_usage(120)
                 
-                return results
+                return results, issue
             else:
                 error_msg = f"RAG service returned status code {response.status_code}"
                 logger.warning(error_msg)
                 
-                self._add_step("error", {
+                issue = ("error", {
                     "message": error_msg,
                     "action": "Using fallback data for analysis"
                 })
@@ -169,13 +257,13 @@ class AutoGenRunner(AgentRunner):
                     result["metadata"]["simulated"] = True
                     result["metadata"]["reason"] = error_msg
                 
-                return results
+                return results, issue
                 
         except Exception as e:
             error_msg = f"Error querying RAG service: {str(e)}"
             logger.error(error_msg)
             
-            self._add_step("error", {
+            issue = ("error", {
                 "message": error_msg,
                 "action": "Using fallback data for analysis"
             })
@@ -185,7 +273,7 @@ class AutoGenRunner(AgentRunner):
                 result["metadata"]["simulated"] = True
                 result["metadata"]["reason"] = error_msg
             
-            return results
+            return results, issue
     
     def _generate_placeholder_results(self, company: str, aspect: str) -> List[Dict[str, Any]]:
         """
@@ -244,32 +332,22 @@ class AutoGenRunner(AgentRunner):
         
         self._add_step("agent_conversation", {
             "agent": "researcher",
-            "message": f"I've gathered comprehensive information about {company}. The company appears to be a significant player in its industry with strong market presence."
+            "message": _RESEARCHER_SUMMARY_TEMPLATE.format(company=company)
         })
         
         self._add_step("agent_conversation", {
             "agent": "analyst",
-            "message": f"Based on the news, {company} is making strategic moves to expand its market reach. Their product portfolio shows innovation and market leadership."
-        })
-        
-        self._add_step("agent_conversation", {
-            "agent": "financial_expert",
-            "message": f"The financial data indicates strong performance with consistent growth. Their profit margins are healthy and they appear to be financially stable."
-        })
-        
-        self._add_step("agent_conversation", {
-            "agent": "researcher",
-            "message": "What are the key strengths and potential risks we should highlight in our report?"
+            "message": _ANALYST_NEWS_TEMPLATE.format(company=company)
         })
         
-        self._add_step("agent_conversation", {
-            "agent": "analyst",
-            "message": f"Key strengths include market leadership, innovative products, and strategic growth initiatives. Potential risks might include market competition and regulatory challenges."
-        })
+        self._add_step("agent_conversation", _FINANCIAL_EXPERT_MSG)
+        self._add_step("agent_conversation", _RESEARCHER_QUESTION_MSG)
+        self._add_step("agent_conversation", _ANALYST_SUMMARY_MSG)
         
         self._update_token_usage(650)
         
-        time.sleep(1.2)
+        if self.simulate_latency:
+            time.sleep(1.2)
     
     def _generate_report(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                         product_info: List[Dict], financial_info: List[Dict]) -> str:
@@ -292,36 +370,23 @@ class AutoGenRunner(AgentRunner):
         product_text = product_info[0]["text"] if product_info else ""
         financial_text = financial_info[0]["text"] if financial_info else ""
         
-        report = f"""# {company} Research Report
-
-{company_text}
-
-{news_text}
-
-{product_text}
-
-{financial_text}
-
-Our multi-agent analysis of {company} reveals a strong market position with innovative products and solid financial performance. The company has demonstrated strategic vision through recent initiatives and maintains a competitive edge in its industry. Based on our comprehensive assessment, {company} shows promising growth potential and resilience in its market sector.
-
-- Strong market leadership and brand recognition
-- Innovative product portfolio with consistent updates
-- Robust financial performance with healthy margins
-- Strategic growth initiatives and market expansion
-
-- Competitive market landscape
-- Regulatory challenges in key markets
-- Potential for market disruption from emerging technologies
-"""
+        report = _REPORT_TEMPLATE.format(
+            company=company,
+            company_text=company_text,
+            news_text=news_text,
+            product_text=product_text,
+            financial_text=financial_text
+        )
         
         self._add_step("report_generation", {
             "thought": f"Generating comprehensive report for {company}",
-            "report_sections": ["Company Overview", "Recent News", "Product Portfolio", "Financial Analysis", "Executive Summary", "Strengths and Opportunities", "Potential Risks"]
+            "report_sections": list(_REPORT_SECTIONS)
         })
         
         self._update_token_usage(450)
         
-        time.sleep(0.9)
+        if self.simulate_latency:
+            time.sleep(0.9)
         
         return report
 
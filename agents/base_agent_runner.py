@@ -7,18 +7,172 @@ implemented by different agent frameworks.
 
 import os
 import time
-import json
+import atexit
+import asyncio
 import logging
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Mapping, Optional, Sequence, Tuple
+
+import httpx
+import orjson
+
+from agents.common.circuit_breaker import rag_breaker
+from agents.common.rag_cache import RAGCache
+from agents.common.rag_client import Placeholder, batch_results, placeholder_results, to_documents
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 LOGS_DIR = Path(os.getenv('LOGS_DIR', 'logs'))
 
+# Set AGENT_SIMULATE_LATENCY=0 to skip the simulated framework delays in runners
+SIMULATE_LATENCY = os.getenv('AGENT_SIMULATE_LATENCY', '1') == '1'
+
+# Set AGENT_STEP_LOG=1 to append each step to logs/{agent_name}/steps_{run_id}.jsonl as it happens
+STREAM_STEPS = os.getenv('AGENT_STEP_LOG', '0') == '1'
+STEP_FLUSH_INTERVAL = 64
+
+
+def _write_log(log_file: Path, payload: bytes) -> None:
+    """
+    Write a serialized run log; runs on the background log executor.
+    
+    Args:
+        log_file: Destination path
+        payload: Serialized log data
+    """
+    try:
+        with open(log_file, 'wb') as f:
+            f.write(payload)
+        logger.info(f"Logged run metadata to {log_file}")
+    except Exception as e:
+        logger.error(f"Error writing run log {log_file}: {str(e)}")
+
+
+_inflight_runs: Dict[Tuple[str, str], Future] = {}
+_inflight_lock = threading.Lock()
+
+# Event loop that async runners issue RAG queries on, started on first use
+_rag_loop: Optional[asyncio.AbstractEventLoop] = None
+_rag_loop_lock = threading.Lock()
+
+
+def _get_rag_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the background event loop for RAG queries, starting it if needed.
+    
+    The loop runs forever in a daemon thread, so runners can submit queries
+    from any thread, including one that is already running an event loop.
+    
+    Returns:
+        The running RAG event loop
+    """
+    global _rag_loop
+    with _rag_loop_lock:
+        if _rag_loop is None:
+            _rag_loop = asyncio.new_event_loop()
+            threading.Thread(target=_rag_loop.run_forever, name="rag-loop", daemon=True).start()
+        return _rag_loop
+
+
+def _reset_rag_loop() -> None:
+    """
+    Forget the RAG event loop in a forked child, which does not inherit its thread.
+    """
+    global _rag_loop, _rag_loop_lock
+    _rag_loop = None
+    _rag_loop_lock = threading.Lock()
+
+
+# Not available on Windows, which has no fork
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_rag_loop)
+
+
+def coalesce_runs(run_task: Callable[[Any, str], Dict[str, Any]]) -> Callable[[Any, str], Dict[str, Any]]:
+    """
+    Share one in-flight run between concurrent run_task calls for the same topic.
+    
+    Calls are keyed on (agent_name, normalized topic). While a run is in progress,
+    other callers wait for it and receive its result instead of issuing the same
+    RAG queries again. Nothing is retained once the run finishes.
+    
+    Args:
+        run_task: The runner's run_task method
+        
+    Returns:
+        Wrapped run_task method
+    """
+    @functools.wraps(run_task)
+    def wrapper(self, topic: str) -> Dict[str, Any]:
+        key = (self.agent_name, topic.strip().lower())
+        
+        with _inflight_lock:
+            future = _inflight_runs.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                _inflight_runs[key] = future
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = run_task(self, topic)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight_runs.pop(key, None)
+    
+    return wrapper
+
+
+# Per-process runner used by AgentRunner.run_batch workers
+_worker_runner = None
+
+
+def _init_batch_worker(runner_cls: type, rag_service_url: str, simulate_latency: bool) -> None:
+    """
+    Create the runner a run_batch worker process reuses for all of its topics.
+    
+    Args:
+        runner_cls: Concrete AgentRunner subclass
+        rag_service_url: URL of the RAG service
+        simulate_latency: Whether the runner sleeps through simulated delays
+    """
+    global _worker_runner
+    _worker_runner = runner_cls(rag_service_url)
+    _worker_runner.simulate_latency = simulate_latency
+
+
+def _run_batch_topic(topic: str) -> Dict[str, Any]:
+    """
+    Run one topic on the worker's runner.
+    
+    Args:
+        topic: The topic or task to perform
+        
+    Returns:
+        The runner's formatted output
+    """
+    result = _worker_runner.run_task(topic)
+    
+    # Worker processes exit without running atexit hooks, so wait for the run log here
+    if _worker_runner._log_future is not None:
+        _worker_runner._log_future.result()
+    
+    return result
+
 
 class AgentRunner(ABC):
     """
@@ -28,21 +182,45 @@ class AgentRunner(ABC):
     must follow to ensure consistent behavior and output format.
     """
     
-    def __init__(self, agent_name: str, rag_service_url: str):
+    # Attributes touched on every step live in slots; subclasses keep a
+    # __dict__ for their framework-specific state
+    __slots__ = (
+        "agent_name", "rag_service_url", "simulate_latency", "start_time", "end_time",
+        "steps", "token_usage", "final_output", "logs_dir",
+        "_lock", "_steps_fp", "_log_future", "_t0_ns", "_t0_wall"
+    )
+    
+    # Run logs are written off the task's critical path; pending writes are
+    # drained at interpreter exit
+    _log_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-log")
+    atexit.register(_log_executor.shutdown, wait=True)
+    
+    def __init__(self, agent_name: str, rag_service_url: str, simulate_latency: Optional[bool] = None):
         """
         Initialize the agent runner.
         
         Args:
             agent_name: Name of the agent framework
             rag_service_url: URL of the RAG service
+            simulate_latency: Whether to sleep through simulated framework delays;
+                defaults to the AGENT_SIMULATE_LATENCY environment variable
         """
         self.agent_name = agent_name
         self.rag_service_url = rag_service_url
+        self.simulate_latency = SIMULATE_LATENCY if simulate_latency is None else simulate_latency
         self.start_time = None
         self.end_time = None
         self.steps = []
         self.token_usage = 0
         self.final_output = ""
+        # Subclasses may query the RAG service from worker threads
+        self._lock = threading.RLock()
+        self._steps_fp = None
+        self._log_future: Optional[Future] = None
+        # Steps record a monotonic offset from this anchor; ISO timestamps are
+        # only formatted when the steps are output
+        self._t0_ns = time.perf_counter_ns()
+        self._t0_wall = time.time()
         
         self.logs_dir = LOGS_DIR / agent_name
         self.logs_dir.mkdir(parents=True, exist_ok=True)
@@ -61,21 +239,51 @@ class AgentRunner(ABC):
         Returns:
             Dictionary containing the agent's results and metadata
         """
+        # A runner may be reused for several tasks, so start each one from a clean slate
         self.start_time = time.time()
+        self.end_time = None
+        self.steps = []
+        self.token_usage = 0
+        self.final_output = ""
         
         self._add_step("task_start", {
-            "topic": topic,
-            "timestamp": datetime.now().isoformat()
+            "topic": topic
         })
         
         pass
     
+    def run_batch(self, topics: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run the task for many topics in parallel worker processes.
+        
+        Each worker builds its own runner of this class, so HTTP clients and
+        event loops are never shared across processes. Workers are spawned
+        rather than forked, since a forked child would inherit the log
+        executor without its threads and never finish writing its run logs.
+        
+        Args:
+            topics: Topics to run, one task each
+            max_workers: Number of worker processes; defaults to the CPU count
+            
+        Returns:
+            Formatted output for each topic, in the same order as topics
+        """
+        if not topics:
+            return []
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(topics))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_batch_worker,
+                                 initargs=(type(self), self.rag_service_url, self.simulate_latency)) as executor:
+            return list(executor.map(_run_batch_topic, topics))
+    
     def log_metadata(self) -> str:
         """
         Store run logs, steps, and timing information.
         
         This method saves the execution metadata to a log file in the
-        logs/{agent_name}/ folder.
+        logs/{agent_name}/ folder. The file is written in the background;
+        the returned path may not exist until the write completes.
         
         Returns:
             Path to the log file
@@ -83,6 +291,14 @@ class AgentRunner(ABC):
         if self.end_time is None:
             self.end_time = time.time()
         
+        self._fill_step_timestamps()
+        
+        # The report is written once at the top level; final_output steps point at it
+        steps = [
+            {**step, "output": "<final_output>"} if step["step_type"] == "final_output" and "output" in step else step
+            for step in self.steps
+        ]
+        
         log_data = {
             "agent_name": self.agent_name,
             "run_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
@@ -90,15 +306,16 @@ class AgentRunner(ABC):
             "end_time": datetime.fromtimestamp(self.end_time).isoformat() if self.end_time else None,
             "response_time": self.end_time - self.start_time if self.start_time and self.end_time else None,
             "token_usage": self.token_usage,
-            "steps": self.steps,
+            "steps": steps,
             "final_output": self.final_output
         }
         
         log_file = self.logs_dir / f"run_{log_data['run_id']}.json"
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
         
-        logger.info(f"Logged run metadata to {log_file}")
+        # Serialize now so later changes to the steps cannot race the write
+        payload = orjson.dumps(log_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        self._log_future = self._log_executor.submit(_write_log, log_file, payload)
+        
         return str(log_file)
     
     def format_output(self) -> Dict[str, Any]:
@@ -113,6 +330,8 @@ class AgentRunner(ABC):
         
         response_time = self.end_time - self.start_time if self.start_time and self.end_time else None
         
+        self._fill_step_timestamps()
+        
         return {
             "agent_name": self.agent_name,
             "final_output": self.final_output,
@@ -129,14 +348,83 @@ class AgentRunner(ABC):
             step_type: Type of step (e.g., 'rag_query', 'reasoning', 'action')
             step_data: Data associated with the step
         """
-        step = {
-            "step_id": len(self.steps) + 1,
-            "step_type": step_type,
-            "timestamp": datetime.now().isoformat(),
-            **step_data
-        }
+        with self._lock:
+            # Copy rather than merge into a new dict; callers may pass shared constants
+            step = step_data.copy()
+            step["step_id"] = len(self.steps) + 1
+            step["step_type"] = step_type
+            step["ts_us"] = (time.perf_counter_ns() - self._t0_ns) // 1000
+            
+            self.steps.append(step)
+            
+            if STREAM_STEPS:
+                self._stream_steps([step])
+    
+    def _add_steps_bulk(self, steps: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add several steps to the execution log at once.
         
-        self.steps.append(step)
+        Args:
+            steps: (step_type, step_data) pairs, in order
+        """
+        with self._lock:
+            ts_us = (time.perf_counter_ns() - self._t0_ns) // 1000
+            first_id = len(self.steps) + 1
+            
+            new_steps = []
+            for offset, (step_type, step_data) in enumerate(steps):
+                step = step_data.copy()
+                step["step_id"] = first_id + offset
+                step["step_type"] = step_type
+                step["ts_us"] = ts_us
+                new_steps.append(step)
+            
+            self.steps.extend(new_steps)
+            
+            if STREAM_STEPS and new_steps:
+                self._stream_steps(new_steps)
+    
+    def _stream_steps(self, steps: List[Dict[str, Any]]) -> None:
+        """
+        Append steps to the run's JSONL step log, flushing in batches.
+        
+        Args:
+            steps: Steps to write, in order
+        """
+        if self._steps_fp is None:
+            run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._steps_fp = open(self.logs_dir / f"steps_{run_id}.jsonl", 'ab', buffering=1 << 16)
+        
+        for step in steps:
+            if "timestamp" not in step:
+                step["timestamp"] = datetime.fromtimestamp(self._t0_wall + step["ts_us"] / 1e6).isoformat()
+        self._steps_fp.writelines(orjson.dumps(step, option=orjson.OPT_NON_STR_KEYS) + b"\n" for step in steps)
+        
+        # Flush whenever the batch crosses a multiple of the flush interval
+        if steps[-1]["step_id"] // STEP_FLUSH_INTERVAL != (steps[0]["step_id"] - 1) // STEP_FLUSH_INTERVAL:
+            self._steps_fp.flush()
+    
+    def _fill_step_timestamps(self) -> None:
+        """
+        Add an ISO timestamp to every step that does not have one yet.
+        """
+        with self._lock:
+            for step in self.steps:
+                if "timestamp" not in step:
+                    step["timestamp"] = datetime.fromtimestamp(self._t0_wall + step["ts_us"] / 1e6).isoformat()
+    
+    def _close_step_log(self) -> None:
+        """
+        Flush, sync and close the JSONL step log if one is open.
+        """
+        with self._lock:
+            if self._steps_fp is None:
+                return
+            
+            self._steps_fp.flush()
+            os.fsync(self._steps_fp.fileno())
+            self._steps_fp.close()
+            self._steps_fp = None
     
     def _update_token_usage(self, additional_tokens: int) -> None:
         """
@@ -145,7 +433,8 @@ class AgentRunner(ABC):
         Args:
             additional_tokens: Number of tokens to add to the counter
         """
-        self.token_usage += additional_tokens
+        with self._lock:
+            self.token_usage += additional_tokens
     
     def _set_final_output(self, output: str) -> None:
         """
@@ -167,9 +456,308 @@ class AgentRunner(ABC):
         self.end_time = time.time()
         
         self._add_step("task_complete", {
-            "timestamp": datetime.now().isoformat(),
             "duration": self.end_time - self.start_time if self.start_time else None
         })
+        
+        self._close_step_log()
+
+
+class AsyncRAGAgentRunner(AgentRunner):
+    """
+    Base class for agent runners that query the RAG service asynchronously.
+    
+    RAG queries for several aspects run concurrently on a background event
+    loop shared by all runners, preferring a single /query_batch request, so
+    run_task may be called from several threads or from async code.
+    Subclasses declare their own _rag_cache so results are cached per
+    framework, and may set a _semantic_cache to reuse results for
+    near-duplicate queries. One circuit breaker is shared by all runners:
+    after three consecutive failures of a RAG service URL, queries return
+    placeholder results for 30 seconds without contacting it.
+    """
+    
+    _rag_cache: RAGCache
+    _semantic_cache = None
+    _rag_breaker = rag_breaker
+    
+    # Placeholder results used when the RAG service has nothing for an aspect
+    _placeholders: Mapping[str, Placeholder] = {}
+    _default_placeholder: Placeholder = ("Information about {company} related to {aspect}.", 0.75, "medium")
+    
+    # Tokens charged for each aspect answered by the RAG service or the cache
+    _rag_query_tokens = 0
+    
+    def __init__(self, agent_name: str, rag_service_url: str, simulate_latency: Optional[bool] = None):
+        """
+        Initialize the agent runner.
+        
+        Args:
+            agent_name: Name of the agent framework
+            rag_service_url: URL of the RAG service
+            simulate_latency: Whether to sleep through simulated framework delays;
+                defaults to the AGENT_SIMULATE_LATENCY environment variable
+        """
+        super().__init__(agent_name, rag_service_url, simulate_latency)
+        
+        # The client is only used on the background RAG loop, so its connection
+        # pool stays valid across run_task calls
+        self._client = self._create_client()
+        # Cleared once the service answers /query_batch with 404 or 405
+        self._batch_supported = True
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Drop all cached RAG results.
+        """
+        cls._rag_cache.clear()
+        if cls._semantic_cache is not None:
+            cls._semantic_cache.clear()
+    
+    def close(self) -> None:
+        """
+        Release the HTTP connection pool.
+        """
+        if not self._client.is_closed:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), _get_rag_loop()).result()
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Create the HTTP client used for RAG queries.
+        
+        Returns:
+            Async HTTP client
+        """
+        return httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=3.0))
+    
+    def _run_rag_queries(self, company: str, aspects: Sequence[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Query the RAG service for several aspects concurrently.
+        
+        Args:
+            company: Company name to research
+            aspects: Aspects to research, one query each
+            
+        Returns:
+            List of result lists, in the same order as aspects
+        """
+        future = asyncio.run_coroutine_threadsafe(self._gather_rag_queries(company, aspects), _get_rag_loop())
+        return future.result()
+    
+    async def _gather_rag_queries(self, company: str, aspects: Sequence[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch results for every aspect, preferring a single batch request.
+        
+        Args:
+            company: Company name to research
+            aspects: Aspects to research, one query each
+            
+        Returns:
+            List of result lists, in the same order as aspects
+        """
+        if len(aspects) > 1 and self._batch_supported:
+            results = await self._aquery_rag_batch(company, aspects)
+            if results is not None:
+                return results
+        
+        return await asyncio.gather(*(self._aquery_rag_service(company, aspect) for aspect in aspects))
+    
+    async def _aquery_rag_batch(self, company: str, aspects: Sequence[str]) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        Query the RAG service for all uncached aspects in one /query_batch call.
+        
+        Args:
+            company: Company name to research
+            aspects: Aspects to research, one query each
+            
+        Returns:
+            List of result lists in the same order as aspects, or None if the
+            service does not support batch queries
+        """
+        results = await self._cache_call(lambda: [self._lookup_cache(company, aspect) for aspect in aspects])
+        missing = [i for i, cached in enumerate(results) if cached is None]
+        answered = len(aspects) - len(missing)
+        
+        if missing:
+            response = None
+            # While the service keeps failing, fall straight back to placeholders
+            if self._rag_breaker.allow(self.rag_service_url):
+                try:
+                    response = await self._client.post(
+                        f"{self.rag_service_url}/query_batch",
+                        json={"queries": [{"q": f"{company} {aspects[i]}", "top_k": 3} for i in missing]}
+                    )
+                except Exception as e:
+                    logger.error("Error querying RAG service: %s", e)
+                    self._rag_breaker.record_failure(self.rag_service_url)
+            
+            if response is not None and response.status_code in (404, 405):
+                # Older RAG services only expose /query; stop trying the batch endpoint
+                self._batch_supported = False
+                return None
+            
+            responses = []
+            if response is not None:
+                if response.status_code == 200:
+                    try:
+                        responses = batch_results(response.content)
+                    except ValueError as e:
+                        logger.error("Malformed RAG service batch response: %s", e)
+                        self._rag_breaker.record_failure(self.rag_service_url)
+                    else:
+                        self._rag_breaker.record_success(self.rag_service_url)
+                else:
+                    self._rag_breaker.record_failure(self.rag_service_url)
+                    logger.warning("RAG service returned status code %s", response.status_code)
+            
+            raw_results = [responses[n] if n < len(responses) else [] for n in range(len(missing))]
+            converted = await self._cache_call(lambda: [
+                self._convert_results(company, aspects[i], raw) for i, raw in zip(missing, raw_results)
+            ])
+            for i, documents in zip(missing, converted):
+                results[i] = documents
+            
+            # Only aspects the service actually answered are charged, as in _aquery_rag_service
+            answered += min(len(responses), len(missing))
+        
+        self._update_token_usage(self._rag_query_tokens * answered)
+        
+        return results
+    
+    def _query_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
+        """
+        Query the RAG service for company information.
+        
+        Args:
+            company: Company name to research
+            aspect: Specific aspect to research (e.g., "latest news")
+            
+        Returns:
+            List of relevant documents
+        """
+        return self._run_rag_queries(company, (aspect,))[0]
+    
+    async def _aquery_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
+        """
+        Query the RAG service for one aspect of the company.
+        
+        Args:
+            company: Company name to research
+            aspect: Specific aspect to research (e.g., "latest news")
+            
+        Returns:
+            List of relevant documents
+        """
+        cached = await self._cache_call(self._lookup_cache, company, aspect)
+        if cached is not None:
+            self._update_token_usage(self._rag_query_tokens)
+            return cached
+        
+        if not self._rag_breaker.allow(self.rag_service_url):
+            return self._generate_placeholder_results(company, aspect)
+        
+        try:
+            response = await self._client.get(
+                f"{self.rag_service_url}/query",
+                params={"q": f"{company} {aspect}", "top_k": 3}
+            )
+            
+            if response.status_code == 200:
+                self._rag_breaker.record_success(self.rag_service_url)
+                data = orjson.loads(response.content)
+                
+                results = await self._cache_call(self._convert_results, company, aspect, data.get("results", []))
+                
+                self._update_token_usage(self._rag_query_tokens)
+                
+                return results
+            else:
+                logger.warning("RAG service returned status code %s", response.status_code)
+                self._rag_breaker.record_failure(self.rag_service_url)
+                return self._generate_placeholder_results(company, aspect)
+                
+        except Exception as e:
+            logger.error("Error querying RAG service: %s", e)
+            self._rag_breaker.record_failure(self.rag_service_url)
+            return self._generate_placeholder_results(company, aspect)
+    
+    async def _cache_call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a cache lookup or store, in a worker thread if it may block.
+        
+        The SQLite tier and the semantic cache's query embedding would
+        otherwise stall every runner's requests on the shared RAG loop.
+        
+        Args:
+            func: Cache function to call
+            *args: Arguments for func
+            
+        Returns:
+            The result of func
+        """
+        if self._rag_cache.persistent or self._semantic_cache is not None:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+    
+    def _lookup_cache(self, company: str, aspect: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results by exact key, then by query similarity.
+        
+        Args:
+            company: Company name
+            aspect: Research aspect
+            
+        Returns:
+            Cached results, or None on a miss
+        """
+        cached = self._rag_cache.get(company, aspect)
+        if cached is not None or self._semantic_cache is None:
+            return cached
+        
+        similar = self._semantic_cache.get(f"{company} {aspect}")
+        if similar is None:
+            return None
+        
+        # Keep the original fetch time so the copy expires with the semantic entry
+        created, results = similar
+        self._rag_cache.set(company, aspect, results, created)
+        return results
+    
+    def _convert_results(self, company: str, aspect: str, raw_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert RAG service results, caching them or falling back to placeholders.
+        
+        Args:
+            company: Company name
+            aspect: Research aspect
+            raw_results: Results as returned by the RAG service
+            
+        Returns:
+            List of relevant documents
+        """
+        results = to_documents(raw_results)
+        
+        if not results:
+            return self._generate_placeholder_results(company, aspect)
+        
+        self._rag_cache.set(company, aspect, results)
+        if self._semantic_cache is not None:
+            self._semantic_cache.set(f"{company} {aspect}", results)
+        
+        return results
+    
+    def _generate_placeholder_results(self, company: str, aspect: str) -> List[Dict[str, Any]]:
+        """
+        Generate placeholder results when RAG service is unavailable.
+        
+        Args:
+            company: Company name
+            aspect: Research aspect
+            
+        Returns:
+            List of placeholder results
+        """
+        return placeholder_results(self._placeholders, self._default_placeholder, company, aspect)
 
 
 if __name__ == "__main__":
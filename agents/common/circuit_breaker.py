@@ -0,0 +1,80 @@
+"""
+Circuit breaker module for the RAG benchmark.
+
+This module lets agents stop contacting a RAG service that keeps failing.
+After a number of consecutive failures the breaker opens for a cool-down
+period, during which agents fall back to placeholder results without making
+a request; the next request after the cool-down probes the service again.
+"""
+
+import time
+import threading
+from typing import Dict, List
+
+
+class CircuitBreaker:
+    """
+    Per-URL consecutive-failure circuit breaker, safe to share across threads.
+    """
+    
+    def __init__(self, threshold: int = 3, cooldown: float = 30.0):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            threshold: Consecutive failures that open the breaker
+            cooldown: Seconds the breaker stays open before the service is tried again
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        # url -> [consecutive failures, monotonic time the breaker closes again]
+        self._state: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def allow(self, url: str) -> bool:
+        """
+        Check whether a request to a service should be attempted.
+        
+        Args:
+            url: Base URL of the service
+            
+        Returns:
+            False while the breaker for the URL is open, True otherwise
+        """
+        with self._lock:
+            state = self._state.get(url)
+            return state is None or time.monotonic() >= state[1]
+    
+    def record_success(self, url: str) -> None:
+        """
+        Record a successful request, closing the breaker.
+        
+        Args:
+            url: Base URL of the service
+        """
+        with self._lock:
+            self._state.pop(url, None)
+    
+    def record_failure(self, url: str) -> None:
+        """
+        Record a failed request, opening the breaker once the threshold is reached.
+        
+        Args:
+            url: Base URL of the service
+        """
+        with self._lock:
+            state = self._state.setdefault(url, [0, 0.0])
+            state[0] += 1
+            if state[0] >= self.threshold:
+                state[1] = time.monotonic() + self.cooldown
+    
+    def reset(self) -> None:
+        """
+        Forget all recorded failures.
+        """
+        with self._lock:
+            self._state.clear()
+
+
+# Shared by every agent runner, so all frameworks see the same RAG service health
+rag_breaker = CircuitBreaker()
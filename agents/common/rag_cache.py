@@ -0,0 +1,300 @@
+"""
+RAG result cache module for the RAG benchmark.
+
+This module provides a two-tier cache for RAG query results keyed on
+(company, aspect): a bounded in-memory LRU with a TTL, optionally backed by a
+SQLite file so results survive across benchmark processes. A semantic cache
+can sit behind it to catch near-duplicate queries that differ only in phrasing.
+"""
+
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+import numpy as np
+import orjson
+
+
+class RAGCache:
+    """
+    Two-tier (memory + SQLite) cache for RAG query results.
+    
+    Caches with different namespaces can share one SQLite file; each namespace
+    keeps its entries in its own table, so they never see or clear each
+    other's results. The SQLite file is opened on first use. Cached result
+    lists are shared between callers and must be treated as read-only.
+    """
+    
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, maxsize: int = 10_000, ttl: float = 3600,
+                 namespace: str = ""):
+        """
+        Initialize the cache.
+        
+        Args:
+            db_path: Path of the SQLite file for the persistent tier, or None for memory only
+            maxsize: Maximum number of entries kept in memory
+            ttl: Seconds before a cached entry expires
+            namespace: Name separating this cache's persistent entries from
+                other caches in the same file, e.g. the agent framework name
+        """
+        if namespace and not namespace.isidentifier():
+            raise ValueError(f"Invalid cache namespace: {namespace!r}")
+        
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_path = db_path
+        self._table = f"rag_cache_{namespace}" if namespace else "rag_cache"
+        self._conn = None
+        
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """
+        Return the SQLite connection, opening it on first use.
+        
+        Must be called with the lock held.
+        
+        Returns:
+            SQLite connection, or None for a memory-only cache
+        """
+        if self._conn is None and self._db_path:
+            Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} (key TEXT PRIMARY KEY, created REAL, results BLOB)"
+            )
+            self._conn.commit()
+        return self._conn
+    
+    @property
+    def persistent(self) -> bool:
+        """
+        Whether the cache has a SQLite tier, whose reads and writes block.
+        """
+        return bool(self._db_path)
+    
+    @staticmethod
+    def make_key(company: str, aspect: str) -> str:
+        """
+        Build the cache key for a query.
+        
+        Args:
+            company: Company name
+            aspect: Research aspect
+            
+        Returns:
+            Normalized cache key
+        """
+        return f"{company.strip().lower()}|{aspect}"
+    
+    def get(self, company: str, aspect: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results, promoting persistent hits into memory.
+        
+        Args:
+            company: Company name
+            aspect: Research aspect
+            
+        Returns:
+            Cached results, or None on a miss
+        """
+        key = self.make_key(company, aspect)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+            
+            conn = self._connection()
+            if conn is not None:
+                row = conn.execute(
+                    f"SELECT created, results FROM {self._table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[0] < self.ttl:
+                    results = orjson.loads(row[1])
+                    self._store_in_memory(key, row[0], results)
+                    self.hits += 1
+                    return results
+            
+            self.misses += 1
+            return None
+    
+    def set(self, company: str, aspect: str, results: List[Dict[str, Any]], created: Optional[float] = None) -> None:
+        """
+        Store results in both cache tiers.
+        
+        Args:
+            company: Company name
+            aspect: Research aspect
+            results: Query results to cache
+            created: Time the results were fetched; defaults to now
+        """
+        key = self.make_key(company, aspect)
+        now = time.time() if created is None else created
+        
+        with self._lock:
+            self._store_in_memory(key, now, results)
+            
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self._table} (key, created, results) VALUES (?, ?, ?)",
+                    (key, now, orjson.dumps(results))
+                )
+                conn.commit()
+    
+    def clear(self) -> None:
+        """
+        Remove every entry of this cache's namespace from both cache tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            self.hits = 0
+            self.misses = 0
+            
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(f"DELETE FROM {self._table}")
+                conn.commit()
+    
+    def _store_in_memory(self, key: str, created: float, results: List[Dict[str, Any]]) -> None:
+        """
+        Insert an entry into the memory tier, evicting the least recently used.
+        
+        Args:
+            key: Cache key
+            created: Time the results were fetched
+            results: Query results
+        """
+        self._memory[key] = (created, results)
+        self._memory.move_to_end(key)
+        
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+
+class SemanticRAGCache:
+    """
+    Embedding-similarity cache for near-duplicate RAG queries.
+    
+    Query embeddings are kept L2-normalized in a fixed-size contiguous matrix
+    used as a ring buffer, so a lookup is a single matrix-vector product.
+    The sentence-transformers model is loaded on first use; loading and
+    encoding block, so callers on an event loop should run them in a thread.
+    """
+    
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", threshold: float = 0.92, maxsize: int = 1024,
+                 ttl: float = 3600):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            model_name: sentence-transformers model used to embed queries
+            threshold: Minimum cosine similarity for a hit
+            maxsize: Maximum number of cached queries
+            ttl: Seconds before a cached query expires
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._model = None
+        self._matrix: Optional[np.ndarray] = None
+        self._created = np.zeros(maxsize)
+        self._results: List[Optional[List[Dict[str, Any]]]] = [None] * maxsize
+        self._count = 0
+        self._next = 0
+        self._pending: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, query: str) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """
+        Return results cached for the most similar earlier query that has not expired.
+        
+        Args:
+            query: Query string
+            
+        Returns:
+            (time the results were fetched, results) if an unexpired query above
+            the similarity threshold exists, else None
+        """
+        vector = self._encode(query)
+        
+        with self._lock:
+            # Remember the embedding so a following set() does not re-encode
+            self._pending[query] = vector
+            while len(self._pending) > 64:
+                self._pending.popitem(last=False)
+            
+            if not self._count:
+                return None
+            
+            scores = self._matrix[:self._count] @ vector
+            scores[time.time() - self._created[:self._count] >= self.ttl] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self._created[best], self._results[best]
+            return None
+    
+    def set(self, query: str, results: List[Dict[str, Any]]) -> None:
+        """
+        Cache results for a query.
+        
+        Args:
+            query: Query string
+            results: Query results to cache
+        """
+        with self._lock:
+            vector = self._pending.pop(query, None)
+        if vector is None:
+            vector = self._encode(query)
+        
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float32)
+            
+            self._matrix[self._next] = vector
+            self._created[self._next] = time.time()
+            self._results[self._next] = results
+            self._next = (self._next + 1) % self.maxsize
+            self._count = min(self._count + 1, self.maxsize)
+    
+    def clear(self) -> None:
+        """
+        Remove every cached query.
+        """
+        with self._lock:
+            self._results = [None] * self.maxsize
+            self._count = 0
+            self._next = 0
+            self._pending.clear()
+    
+    def _encode(self, query: str) -> np.ndarray:
+        """
+        Embed and L2-normalize a query.
+        
+        Args:
+            query: Query string
+            
+        Returns:
+            Normalized float32 embedding
+        """
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+            model = self._model
+        
+        vector = np.asarray(model.encode(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -1,5 +1,98 @@
-import requests
-from typing import List, Dict, Any
+import httpx
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+
+# (text template, score, relevance) used when the RAG service has nothing for an aspect
+Placeholder = Tuple[str, float, str]
+
+
+def to_documents(raw_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert RAG service query results into the documents agents record.
+    
+    Args:
+        raw_results: Results as returned by the RAG service
+        
+    Returns:
+        List of documents with text, metadata and score
+    """
+    return [
+        {"text": r.get("chunk", ""), "metadata": r.get("metadata", {}), "score": r.get("score", 0.0)}
+        for r in raw_results
+    ]
+
+
+def batch_results(content: bytes) -> List[List[Dict[str, Any]]]:
+    """
+    Decode a /query_batch response body into one result list per query.
+    
+    Args:
+        content: Raw response body
+        
+    Returns:
+        Raw results for each answered query, in request order
+        
+    Raises:
+        ValueError: If the body is not a well-formed batch response
+    """
+    data = orjson.loads(content)
+    responses = data.get("responses") if isinstance(data, dict) else None
+    if not isinstance(responses, list):
+        raise ValueError("batch response has no responses list")
+    
+    results = [r.get("results", []) if isinstance(r, dict) else None for r in responses]
+    if not all(isinstance(hits, list) and all(isinstance(hit, dict) for hit in hits) for hits in results):
+        raise ValueError("batch response has a malformed entry")
+    
+    return results
+
+
+def placeholder_results(placeholders: Mapping[str, Placeholder], default: Placeholder,
+                        company: str, aspect: str) -> List[Dict[str, Any]]:
+    """
+    Build simulated results for an aspect from an agent's placeholder table.
+    
+    Args:
+        placeholders: Placeholder per aspect; templates may use {company} and {aspect}
+        default: Placeholder for aspects missing from the table
+        company: Company name
+        aspect: Research aspect
+        
+    Returns:
+        List of placeholder results
+    """
+    template, score, relevance = placeholders.get(aspect, default)
+    return [{
+        "text": template.format(company=company, aspect=aspect),
+        "metadata": {"source": "simulated", "relevance": relevance},
+        "score": score
+    }]
+
+
+class RAGIngestError(Exception):
+    """
+    Raised when some chunks of a chunked ingest fail.
+    
+    Chunks not listed in failed_chunks were ingested by the service and are
+    not rolled back.
+    
+    Attributes:
+        failed_chunks (List[int]): Indices of the chunks that failed
+        responses (List[Optional[Dict]]): Service response per chunk, None for failed chunks
+        errors (Dict[int, Exception]): Error raised for each failed chunk
+    """
+    
+    def __init__(self, failed_chunks: List[int], responses: List[Optional[Dict[str, Any]]],
+                 errors: Dict[int, Exception]):
+        super().__init__(
+            f"RAG service ingestion failed for chunks {failed_chunks} of {len(responses)}; "
+            "the other chunks were ingested"
+        )
+        self.failed_chunks = failed_chunks
+        self.responses = responses
+        self.errors = errors
+
 
 class RAGClient:
     """
@@ -15,6 +108,16 @@ class RAGClient:
         """
         self.rag_service_url = rag_service_url
         
+        # One pooled client shared by all calls; HTTP/2 multiplexes concurrent
+        # requests over a single connection where the server negotiates it
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+        self.client = httpx.Client(
+            transport=httpx.HTTPTransport(http2=True, limits=limits, retries=2),
+            timeout=httpx.Timeout(30.0, connect=3.0),
+            # The RAG service gzips responses over 1 KiB (see rag_service/app/main.py)
+            headers={"Accept-Encoding": "gzip"}
+        )
+        
     def query(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
         Query the RAG service for relevant documents.
@@ -26,7 +129,7 @@ class RAGClient:
         Returns:
             List of retrieved documents
         """
-        response = requests.post(
+        response = self.client.post(
             f"{self.rag_service_url}/query",
             json={"query": query, "top_k": top_k}
         )
@@ -36,17 +139,84 @@ class RAGClient:
             
         return response.json()["documents"]
     
-    def ingest(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def query_batch(self, queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Run several queries against the RAG service in a single request.
+        
+        Args:
+            queries: Queries as {"q": query string, "top_k": number of results} dicts
+            
+        Returns:
+            One list of retrieved chunks per query, in the same order
+        """
+        response = self.client.post(
+            f"{self.rag_service_url}/query_batch",
+            json={"queries": queries}
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"RAG service batch query failed: {response.text}")
+        
+        return [item["results"] for item in response.json()["responses"]]
+    
+    def ingest(self, documents: List[Dict[str, Any]], chunk_size: int = 256,
+               max_concurrency: int = 8) -> Dict[str, Any]:
         """
         Ingest documents into the RAG service.
         
+        Large document lists are split into chunks that are posted concurrently,
+        which keeps request bodies small and lets the service index them in parallel.
+        A list that fits in one chunk is posted as a single request.
+        
         Args:
             documents: List of documents to ingest
+            chunk_size: Maximum number of documents per request
+            max_concurrency: Maximum number of requests in flight
+            
+        Returns:
+            Response from the RAG service for a single request, or an aggregated
+            response with one entry per submitted chunk
+            
+        Raises:
+            RAGIngestError: If any chunk of a chunked ingest failed
+        """
+        if len(documents) <= chunk_size:
+            return self._ingest_batch(documents)
+        
+        batches = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
+        
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as executor:
+            futures = [executor.submit(self._ingest_batch, batch) for batch in batches]
+        
+        responses = []
+        errors = {}
+        for i, future in enumerate(futures):
+            try:
+                responses.append(future.result())
+            except Exception as e:
+                responses.append(None)
+                errors[i] = e
+        
+        if errors:
+            raise RAGIngestError(list(errors), responses, errors)
+        
+        return {
+            "status": "success",
+            "documents_submitted": len(documents),
+            "responses": responses
+        }
+    
+    def _ingest_batch(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Post one chunk of documents to the RAG service.
+        
+        Args:
+            documents: Documents in this chunk
             
         Returns:
             Response from the RAG service
         """
-        response = requests.post(
+        response = self.client.post(
             f"{self.rag_service_url}/ingest",
             json={"documents": documents}
         )
@@ -55,3 +225,9 @@ class RAGClient:
             raise Exception(f"RAG service ingestion failed: {response.text}")
             
         return response.json()
+    
+    def close(self) -> None:
+        """
+        Release the pooled HTTP connections.
+        """
+        self.client.close()
@@ -9,22 +9,55 @@ import time
 import json
 import random
 import logging
-import requests
-from typing import Dict, List, Any, Optional
+import httpx
+from typing import Dict, List, Any
 from datetime import datetime
 
-from agents.base_agent_runner import AgentRunner
+from agents.base_agent_runner import AsyncRAGAgentRunner, coalesce_runs
+from agents.common.rag_cache import RAGCache, SemanticRAGCache
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class CrewAIRunner(AgentRunner):
+RAG_ASPECTS = ("company information", "latest news", "products and services", "financial performance")
+
+# Fixed report text; only the company name varies per task
+_REPORT_HEADER_TMPL = "# {company} Research Report"
+_REPORT_SUMMARY_TMPL = "Based on our research, {company} demonstrates strong market positioning with innovative products and solid financial performance. The company has shown consistent growth and strategic initiatives that position it well for future success.\n"
+# Placeholder (text template, score, relevance) per aspect when the RAG service has no results
+_PLACEHOLDERS = {
+    "company information": ("{company} is a leading company in its industry, known for innovation and quality products.", 0.95, "high"),
+    "latest news": ("{company} recently announced a new strategic partnership to expand its market reach.", 0.92, "high"),
+    "products and services": ("{company}'s flagship product line continues to see strong growth, with new features added quarterly.", 0.88, "high"),
+    "financial performance": ("{company} reported strong quarterly earnings, exceeding analyst expectations with revenue growth of 15%.", 0.90, "high")
+}
+_DEFAULT_PLACEHOLDER = ("Information about {company} related to {aspect}.", 0.75, "medium")
+
+_ANALYSIS_TEMPLATES = (
+    ("Analyzing general information about {company}", "Company appears to be well-established in its industry with a strong reputation."),
+    ("Analyzing latest news about {company}", "Recent news suggests strategic growth initiatives and positive market reception."),
+    ("Analyzing product portfolio of {company}", "Product lineup shows innovation focus with regular updates and feature additions."),
+    ("Analyzing financial performance of {company}", "Financial indicators suggest strong performance with consistent growth.")
+)
+_REPORT_SECTIONS = ("Company Overview", "Latest News", "Products and Services", "Financial Trends", "Summary")
+
+class CrewAIRunner(AsyncRAGAgentRunner):
     """
     Implementation of the AgentRunner for CrewAI.
     
     This agent is tasked with researching a given company using the CrewAI framework.
+    RAG results are cached per (company, aspect) across runner instances; set
+    RAG_CACHE_PATH to also persist them in a SQLite file, and RAG_SEMANTIC_CACHE=1
+    to reuse results for near-duplicate queries. The simulated planning, analysis
+    and reporting delays can be disabled by setting AGENT_SIMULATE_LATENCY to 0.
     """
     
+    _rag_cache = RAGCache(os.getenv("RAG_CACHE_PATH") or None, namespace="crewai")
+    _semantic_cache = SemanticRAGCache(ttl=_rag_cache.ttl) if os.getenv("RAG_SEMANTIC_CACHE", "0") == "1" else None
+    _placeholders = _PLACEHOLDERS
+    _default_placeholder = _DEFAULT_PLACEHOLDER
+    _rag_query_tokens = 100
+    
     def __init__(self, rag_service_url: str):
         """
         Initialize the CrewAI runner.
@@ -34,7 +67,24 @@ class CrewAIRunner(AgentRunner):
         """
         super().__init__("crewai", rag_service_url)
         
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Create the HTTP client used for RAG queries.
+        
+        HTTP/2 multiplexes the concurrent queries over a single connection
+        where the server negotiates it.
         
+        Returns:
+            Async HTTP client
+        """
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=4),
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            headers={"Accept-Encoding": "gzip"}
+        )
+        
+    @coalesce_runs
     def run_task(self, topic: str) -> Dict[str, Any]:
         """
         Research a company using CrewAI agents.
@@ -50,28 +100,26 @@ class CrewAIRunner(AgentRunner):
         
         self._simulate_research_planning(topic)
         
-        company_info = self._query_rag_service(topic, "company information")
+        company_info, news_info, product_info, financial_info = self._run_rag_queries(topic, RAG_ASPECTS)
+        
         self._add_step("rag_query", {
             "query": f"Information about {topic}",
             "results": company_info,
             "usage": "Used to gather general company information"
         })
         
-        news_info = self._query_rag_service(topic, "latest news")
         self._add_step("rag_query", {
             "query": f"Latest news about {topic}",
             "results": news_info,
             "usage": "Used to gather recent news about the company"
         })
         
-        product_info = self._query_rag_service(topic, "products and services")
         self._add_step("rag_query", {
             "query": f"Products and services of {topic}",
             "results": product_info,
             "usage": "Used to gather information about company products"
         })
         
-        financial_info = self._query_rag_service(topic, "financial performance")
         self._add_step("rag_query", {
             "query": f"Financial trends and performance of {topic}",
             "results": financial_info,
@@ -110,94 +158,8 @@ class CrewAIRunner(AgentRunner):
         
         self._update_token_usage(250)
         
-        time.sleep(0.5)
-    
-    def _query_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Query the RAG service for company information.
-        
-        Args:
-            company: Company name to research
-            aspect: Specific aspect to research (e.g., "latest news")
-            
-        Returns:
-            List of relevant documents
-        """
-        try:
-            query = f"{company} {aspect}"
-            
-            # Call RAG service
-            response = requests.get(
-                f"{self.rag_service_url}/query",
-                params={"q": query, "top_k": 3}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                results = []
-                for result in data.get("results", []):
-                    results.append({
-                        "text": result.get("chunk", ""),
-                        "metadata": result.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    })
-                
-                if not results:
-                    results = self._generate_placeholder_results(company, aspect)
-                
-                self._update_token_usage(100)
-                
-                return results
-            else:
-                logger.warning(f"RAG service returned status code {response.status_code}")
-                return self._generate_placeholder_results(company, aspect)
-                
-        except Exception as e:
-            logger.error(f"Error querying RAG service: {str(e)}")
-            return self._generate_placeholder_results(company, aspect)
-    
-    def _generate_placeholder_results(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Generate placeholder results when RAG service is unavailable.
-        
-        Args:
-            company: Company name
-            aspect: Research aspect
-            
-        Returns:
-            List of placeholder results
-        """
-        if aspect == "company information":
-            return [{
-                "text": f"{company} is a leading company in its industry, known for innovation and quality products.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.95
-            }]
-        elif aspect == "latest news":
-            return [{
-                "text": f"{company} recently announced a new strategic partnership to expand its market reach.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.92
-            }]
-        elif aspect == "products and services":
-            return [{
-                "text": f"{company}'s flagship product line continues to see strong growth, with new features added quarterly.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.88
-            }]
-        elif aspect == "financial performance":
-            return [{
-                "text": f"{company} reported strong quarterly earnings, exceeding analyst expectations with revenue growth of 15%.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.90
-            }]
-        else:
-            return [{
-                "text": f"Information about {company} related to {aspect}.",
-                "metadata": {"source": "simulated", "relevance": "medium"},
-                "score": 0.75
-            }]
+        if self.simulate_latency:
+            time.sleep(0.5)
     
     def _simulate_analysis(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                           product_info: List[Dict], financial_info: List[Dict]) -> None:
@@ -212,29 +174,15 @@ class CrewAIRunner(AgentRunner):
             financial_info: Financial information
         """
         
-        self._add_step("analysis", {
-            "thought": f"Analyzing general information about {company}",
-            "insights": "Company appears to be well-established in its industry with a strong reputation."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing latest news about {company}",
-            "insights": "Recent news suggests strategic growth initiatives and positive market reception."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing product portfolio of {company}",
-            "insights": "Product lineup shows innovation focus with regular updates and feature additions."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing financial performance of {company}",
-            "insights": "Financial indicators suggest strong performance with consistent growth."
-        })
+        self._add_steps_bulk([
+            ("analysis", {"thought": thought.format(company=company), "insights": insights})
+            for thought, insights in _ANALYSIS_TEMPLATES
+        ])
         
         self._update_token_usage(500)
         
-        time.sleep(1.0)
+        if self.simulate_latency:
+            time.sleep(1.0)
     
     def _generate_report(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                         product_info: List[Dict], financial_info: List[Dict]) -> str:
@@ -257,27 +205,24 @@ class CrewAIRunner(AgentRunner):
         product_text = product_info[0]["text"] if product_info else ""
         financial_text = financial_info[0]["text"] if financial_info else ""
         
-        report = f"""# {company} Research Report
-
-{company_text}
-
-{news_text}
-
-{product_text}
-
-{financial_text}
-
-Based on our research, {company} demonstrates strong market positioning with innovative products and solid financial performance. The company has shown consistent growth and strategic initiatives that position it well for future success.
-"""
+        report = "\n\n".join([
+            _REPORT_HEADER_TMPL.format(company=company),
+            company_text,
+            news_text,
+            product_text,
+            financial_text,
+            _REPORT_SUMMARY_TMPL.format(company=company)
+        ])
         
         self._add_step("report_generation", {
             "thought": f"Generating comprehensive report for {company}",
-            "report_sections": ["Company Overview", "Latest News", "Products and Services", "Financial Trends", "Summary"]
+            "report_sections": list(_REPORT_SECTIONS)
         })
         
         self._update_token_usage(350)
         
-        time.sleep(0.8)
+        if self.simulate_latency:
+            time.sleep(0.8)
         
         return report
 
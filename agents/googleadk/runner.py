@@ -13,6 +13,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from agents.base_agent_runner import AgentRunner
+from agents.common.rag_client import to_documents
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -132,13 +133,7 @@ class GoogleADKRunner(AgentRunner):
             if response.status_code == 200:
                 data = response.json()
                 
-                results = []
-                for result in data.get("results", []):
-                    results.append({
-                        "text": result.get("chunk", ""),
-                        "metadata": result.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    })
+                results = to_documents(data.get("results", []))
                 
                 if not results:
                     results = self._generate_placeholder_results(company, aspect)
@@ -9,27 +9,69 @@ import os
 import time
 import json
 import logging
-import requests
-from typing import Dict, List, Any, Optional
+import httpx
+from typing import Dict, List, Any
 from datetime import datetime
 
-from agents.base_agent_runner import AgentRunner
+from agents.base_agent_runner import AsyncRAGAgentRunner
+from agents.common.rag_cache import RAGCache
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class H2OAIRunner(AgentRunner):
+RAG_ASPECTS = ("company overview", "financial performance", "products and services", "market forecast")
+
+# Placeholder (text template, score, relevance) per aspect when the RAG service has no results
+_PLACEHOLDERS = {
+    "company overview": ("{company} is an established player in its industry with a strong focus on innovation and market expansion.", 0.95, "high"),
+    "financial performance": ("{company} has demonstrated consistent financial growth with a compound annual growth rate of 12% over the past five years.", 0.92, "high"),
+    "products and services": ("{company}'s diverse product portfolio addresses multiple market segments with solutions that have received industry recognition for innovation.", 0.90, "high"),
+    "market forecast": ("Industry analysts project continued growth for {company} with an estimated market share increase of 2.5% annually for the next three years.", 0.88, "high")
+}
+_DEFAULT_PLACEHOLDER = ("Information about {company} related to {aspect}.", 0.75, "medium")
+
+_PLAN_TEMPLATES = (
+    "1. Gather baseline information about {company}",
+    "2. Collect financial performance data",
+    "3. Research product portfolio and market presence",
+    "4. Analyze market forecasts and predictive indicators",
+    "5. Run predictive models on gathered data",
+    "6. Synthesize insights into a data-driven report"
+)
+
+# Fixed report text; only the company name varies per task
+_REPORT_HEADER_TMPL = "# {company} Research Report"
+_REPORT_INSIGHTS_TMPL = """Our predictive models indicate a positive growth trajectory for {company} over the next 12-24 months. Time series analysis of financial performance suggests continued revenue expansion with an estimated growth rate of 8-12% annually, accounting for seasonal variations.
+
+Market segmentation analysis reveals strong positioning in the enterprise and consumer segments, with potential for further penetration in government contracts. The predictive models identify product innovation rate and customer retention as the most significant factors influencing future performance.
+
+Based on our comprehensive analysis, we forecast:
+- Revenue growth exceeding industry average by 2.5%
+- Expansion in market share of core product categories
+- Increased profitability through operational efficiencies
+- Potential challenges from emerging competition in Q3-Q4
+"""
+_REPORT_SECTIONS = ("Company Overview", "Financial Analysis", "Products and Services", "Market Forecast", "Predictive Analytics Insights")
+
+class H2OAIRunner(AsyncRAGAgentRunner):
     """
     Implementation of the AgentRunner for H2O AI.
     
     This agent is tasked with researching a given company using the H2O AI framework,
     which specializes in predictive analytics and machine learning for data-driven insights.
+    RAG results are cached per (company, aspect) across runner instances; set
+    RAG_CACHE_PATH to also persist them in a SQLite file. The simulated planning,
+    analytics and reporting delays can be disabled by setting AGENT_SIMULATE_LATENCY to 0.
     
     Attributes:
         agent_name (str): Name of the agent framework ("h2oai")
         rag_service_url (str): URL of the RAG service
     """
     
+    _rag_cache = RAGCache(os.getenv("RAG_CACHE_PATH") or None, namespace="h2oai")
+    _placeholders = _PLACEHOLDERS
+    _default_placeholder = _DEFAULT_PLACEHOLDER
+    _rag_query_tokens = 100
+    
     def __init__(self, rag_service_url: str):
         """
         Initialize the H2O AI runner.
@@ -39,7 +81,22 @@ class H2OAIRunner(AgentRunner):
         """
         super().__init__("h2oai", rag_service_url)
         
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Create the HTTP client used for RAG queries.
+        
+        HTTP/2 multiplexes the concurrent queries over a single connection
+        where the server negotiates it.
         
+        Returns:
+            Async HTTP client
+        """
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=4),
+            timeout=httpx.Timeout(10.0, connect=3.0)
+        )
+    
     def run_task(self, topic: str) -> Dict[str, Any]:
         """
         Research a company using H2O AI.
@@ -58,33 +115,30 @@ class H2OAIRunner(AgentRunner):
         
         self._simulate_research_planning(topic)
         
-        company_info = self._query_rag_service(topic, "company overview")
-        self._add_step("rag_query", {
-            "query": f"Company overview for {topic}",
-            "results": company_info,
-            "usage": "Used to gather general company information"
-        })
-        
-        financial_info = self._query_rag_service(topic, "financial performance")
-        self._add_step("rag_query", {
-            "query": f"Financial performance of {topic}",
-            "results": financial_info,
-            "usage": "Used to analyze financial health and trends"
-        })
-        
-        product_info = self._query_rag_service(topic, "products and services")
-        self._add_step("rag_query", {
-            "query": f"Products and services of {topic}",
-            "results": product_info,
-            "usage": "Used to gather information about company products"
-        })
-        
-        forecast_info = self._query_rag_service(topic, "market forecast")
-        self._add_step("rag_query", {
-            "query": f"Market forecast for {topic}",
-            "results": forecast_info,
-            "usage": "Used to predict future performance and trends"
-        })
+        company_info, financial_info, product_info, forecast_info = self._run_rag_queries(topic, RAG_ASPECTS)
+        
+        self._add_steps_bulk([
+            ("rag_query", {
+                "query": f"Company overview for {topic}",
+                "results": company_info,
+                "usage": "Used to gather general company information"
+            }),
+            ("rag_query", {
+                "query": f"Financial performance of {topic}",
+                "results": financial_info,
+                "usage": "Used to analyze financial health and trends"
+            }),
+            ("rag_query", {
+                "query": f"Products and services of {topic}",
+                "results": product_info,
+                "usage": "Used to gather information about company products"
+            }),
+            ("rag_query", {
+                "query": f"Market forecast for {topic}",
+                "results": forecast_info,
+                "usage": "Used to predict future performance and trends"
+            })
+        ])
         
         self._simulate_predictive_analytics(topic, company_info, financial_info, product_info, forecast_info)
         
@@ -110,110 +164,13 @@ class H2OAIRunner(AgentRunner):
         
         self._add_step("planning", {
             "thought": f"Planning research approach for {company} using predictive analytics",
-            "plan": [
-                f"1. Gather baseline information about {company}",
-                f"2. Collect financial performance data",
-                f"3. Research product portfolio and market presence",
-                f"4. Analyze market forecasts and predictive indicators",
-                f"5. Run predictive models on gathered data",
-                f"6. Synthesize insights into a data-driven report"
-            ]
+            "plan": [step.format(company=company) for step in _PLAN_TEMPLATES]
         })
         
         self._update_token_usage(250)
         
-        time.sleep(0.5)
-    
-    def _query_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Query the RAG service for company information.
-        
-        This method retrieves relevant information from the RAG service
-        based on the company name and specific aspect to research.
-        
-        Args:
-            company: Company name to research
-            aspect: Specific aspect to research (e.g., "company overview")
-            
-        Returns:
-            List of relevant documents
-        """
-        try:
-            query = f"{company} {aspect}"
-            
-            response = requests.get(
-                f"{self.rag_service_url}/query",
-                params={"q": query, "top_k": 3}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                results = []
-                for result in data.get("results", []):
-                    results.append({
-                        "text": result.get("chunk", ""),
-                        "metadata": result.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    })
-                
-                if not results:
-                    results = self._generate_placeholder_results(company, aspect)
-                
-                self._update_token_usage(100)
-                
-                return results
-            else:
-                logger.warning(f"RAG service returned status code {response.status_code}")
-                return self._generate_placeholder_results(company, aspect)
-                
-        except Exception as e:
-            logger.error(f"Error querying RAG service: {str(e)}")
-            return self._generate_placeholder_results(company, aspect)
-    
-    def _generate_placeholder_results(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Generate placeholder results when RAG service is unavailable.
-        
-        This method creates simulated results for testing and fallback purposes.
-        
-        Args:
-            company: Company name
-            aspect: Research aspect
-            
-        Returns:
-            List of placeholder results
-        """
-        if aspect == "company overview":
-            return [{
-                "text": f"{company} is an established player in its industry with a strong focus on innovation and market expansion.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.95
-            }]
-        elif aspect == "financial performance":
-            return [{
-                "text": f"{company} has demonstrated consistent financial growth with a compound annual growth rate of 12% over the past five years.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.92
-            }]
-        elif aspect == "products and services":
-            return [{
-                "text": f"{company}'s diverse product portfolio addresses multiple market segments with solutions that have received industry recognition for innovation.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.90
-            }]
-        elif aspect == "market forecast":
-            return [{
-                "text": f"Industry analysts project continued growth for {company} with an estimated market share increase of 2.5% annually for the next three years.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.88
-            }]
-        else:
-            return [{
-                "text": f"Information about {company} related to {aspect}.",
-                "metadata": {"source": "simulated", "relevance": "medium"},
-                "score": 0.75
-            }]
+        if self.simulate_latency:
+            time.sleep(0.5)
     
     def _simulate_predictive_analytics(self, company: str, company_info: List[Dict], financial_info: List[Dict], 
                                      product_info: List[Dict], forecast_info: List[Dict]) -> None:
@@ -261,7 +218,8 @@ class H2OAIRunner(AgentRunner):
         
         self._update_token_usage(600)
         
-        time.sleep(1.5)
+        if self.simulate_latency:
+            time.sleep(1.5)
     
     def _generate_report(self, company: str, company_info: List[Dict], financial_info: List[Dict], 
                         product_info: List[Dict], forecast_info: List[Dict]) -> str:
@@ -287,35 +245,24 @@ class H2OAIRunner(AgentRunner):
         product_text = product_info[0]["text"] if product_info else ""
         forecast_text = forecast_info[0]["text"] if forecast_info else ""
         
-        report = f"""# {company} Research Report
-
-{company_text}
-
-{financial_text}
-
-{product_text}
-
-{forecast_text}
-
-Our predictive models indicate a positive growth trajectory for {company} over the next 12-24 months. Time series analysis of financial performance suggests continued revenue expansion with an estimated growth rate of 8-12% annually, accounting for seasonal variations.
-
-Market segmentation analysis reveals strong positioning in the enterprise and consumer segments, with potential for further penetration in government contracts. The predictive models identify product innovation rate and customer retention as the most significant factors influencing future performance.
-
-Based on our comprehensive analysis, we forecast:
-- Revenue growth exceeding industry average by 2.5%
-- Expansion in market share of core product categories
-- Increased profitability through operational efficiencies
-- Potential challenges from emerging competition in Q3-Q4
-"""
+        report = "\n\n".join([
+            _REPORT_HEADER_TMPL.format(company=company),
+            company_text,
+            financial_text,
+            product_text,
+            forecast_text,
+            _REPORT_INSIGHTS_TMPL.format(company=company)
+        ])
         
         self._add_step("report_generation", {
             "thought": f"Generating data-driven report for {company}",
-            "report_sections": ["Company Overview", "Financial Analysis", "Products and Services", "Market Forecast", "Predictive Analytics Insights"]
+            "report_sections": list(_REPORT_SECTIONS)
         })
         
         self._update_token_usage(450)
         
-        time.sleep(0.9)
+        if self.simulate_latency:
+            time.sleep(0.9)
         
         return report
 
@@ -9,21 +9,77 @@ import time
 import json
 import logging
 import requests
-from typing import Dict, List, Any, Optional
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 
 from agents.base_agent_runner import AgentRunner
+from agents.common.circuit_breaker import rag_breaker
+from agents.common.rag_cache import RAGCache
+from agents.common.rag_client import batch_results, placeholder_results, to_documents
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Placeholder (text template, score, relevance) per aspect when the RAG service has no results
+_PLACEHOLDERS = {
+    "company profile": ("{company} is a leading global corporation with a diverse portfolio of products and services, operating in multiple markets worldwide.", 0.96, "high"),
+    "latest news": ("{company} has recently announced a strategic partnership to enhance its product offerings and expand into new markets.", 0.93, "high"),
+    "products and services": ("{company}'s product lineup includes cutting-edge solutions that have received industry recognition for innovation and quality.", 0.91, "high"),
+    "financial performance": ("{company} reported strong quarterly results with revenue growth of 12% year-over-year and improved profit margins.", 0.94, "high")
+}
+_DEFAULT_PLACEHOLDER = ("Information about {company} related to {aspect}.", 0.80, "medium")
+
+_ANALYSIS_TEMPLATES = (
+    ("Analyzing company profile of {company}", "Company has a strong market position and global presence."),
+    ("Analyzing news about {company}", "Recent news indicates strategic growth initiatives and positive market reception."),
+    ("Analyzing product portfolio of {company}", "Product lineup shows innovation focus with regular updates and feature additions."),
+    ("Analyzing financial performance of {company}", "Financial indicators suggest strong performance with consistent growth.")
+)
+
+_PLAN_TEMPLATES = (
+    "1. Gather general information about {company}",
+    "2. Research latest news and press releases",
+    "3. Analyze product portfolio and market position",
+    "4. Examine financial performance and trends"
+)
+
+# Fixed report text; only the company name varies per task
+_REPORT_TMPL = """# {company} Research Report
+
+{company} is a leading global corporation with a diverse portfolio of products and services, operating in multiple markets worldwide.
+
+{company} has recently announced a strategic partnership to enhance its product offerings and expand into new markets.
+
+{company}'s product lineup includes cutting-edge solutions that have received industry recognition for innovation and quality.
+
+{company} reported strong quarterly results with revenue growth of 12% year-over-year and improved profit margins.
+
+Based on our graph-based analysis, {company} demonstrates strong market positioning with innovative products and solid financial performance. The company has shown consistent growth and strategic initiatives that position it well for future success.
+
+- Strong global presence and brand recognition
+- Strategic partnerships driving growth
+- Innovative product portfolio with industry recognition
+- Consistent financial performance with healthy margins
+"""
+_REPORT_SECTIONS = ("Company Profile", "Latest News", "Products and Market Position", "Financial Performance", "Summary Analysis", "Key Insights")
+
 class LangGraphRunner(AgentRunner):
     """
     Implementation of the AgentRunner for LangGraph.
     
     This agent is tasked with researching a given company using the LangGraph framework.
+    RAG results are cached per (company, aspect) across runner instances; set
+    RAG_CACHE_PATH to also persist them in a SQLite file. The simulated node delays
+    can be disabled by setting AGENT_SIMULATE_LATENCY to 0. A RAG service that keeps
+    failing is skipped through the circuit breaker shared by all runners.
     """
     
+    _rag_cache = RAGCache(os.getenv("RAG_CACHE_PATH") or None, namespace="langgraph")
+    _rag_breaker = rag_breaker
+    
     def __init__(self, rag_service_url: str):
         """
         Initialize the LangGraph runner.
@@ -33,6 +89,27 @@ class LangGraphRunner(AgentRunner):
         """
         super().__init__("langgraph", rag_service_url)
         
+        # Keep-alive pool shared by every RAG query the graph nodes issue
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                              max_retries=Retry(total=2, backoff_factor=0.1))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Cleared once the service answers /query_batch with 404 or 405
+        self._batch_supported = True
+        
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Drop all cached RAG results.
+        """
+        cls._rag_cache.clear()
+    
+    def close(self) -> None:
+        """
+        Release the HTTP connection pool.
+        """
+        self.session.close()
         
     def run_task(self, topic: str) -> Dict[str, Any]:
         """
@@ -83,31 +160,30 @@ class LangGraphRunner(AgentRunner):
         
         self._add_step("planning", {
             "thought": f"Planning research approach for {company}",
-            "plan": [
-                f"1. Gather general information about {company}",
-                f"2. Research latest news and press releases",
-                f"3. Analyze product portfolio and market position",
-                f"4. Examine financial performance and trends"
-            ]
+            "plan": [step.format(company=company) for step in _PLAN_TEMPLATES]
         })
         
-        company_info = self._query_rag_service(company, "company profile")
-        self._add_step("rag_query", {
-            "query": f"Company profile for {company}",
-            "results": company_info,
-            "usage": "Used to gather general company information"
-        })
-        
-        news_info = self._query_rag_service(company, "latest news")
-        self._add_step("rag_query", {
-            "query": f"Latest news about {company}",
-            "results": news_info,
-            "usage": "Used to gather recent news about the company"
-        })
+        rag_results = self._query_rag_service_batch(company, ("company profile", "latest news"))
+        company_info = rag_results["company profile"]
+        news_info = rag_results["latest news"]
+        
+        self._add_steps_bulk([
+            ("rag_query", {
+                "query": f"Company profile for {company}",
+                "results": company_info,
+                "usage": "Used to gather general company information"
+            }),
+            ("rag_query", {
+                "query": f"Latest news about {company}",
+                "results": news_info,
+                "usage": "Used to gather recent news about the company"
+            })
+        ])
         
         self._update_token_usage(350)
         
-        time.sleep(0.8)
+        if self.simulate_latency:
+            time.sleep(0.8)
     
     def _simulate_analysis_node(self, company: str) -> None:
         """
@@ -122,43 +198,30 @@ class LangGraphRunner(AgentRunner):
             "thought": f"Analyzing gathered information about {company}"
         })
         
-        product_info = self._query_rag_service(company, "products and services")
-        self._add_step("rag_query", {
-            "query": f"Products and services of {company}",
-            "results": product_info,
-            "usage": "Used to analyze product portfolio"
-        })
-        
-        financial_info = self._query_rag_service(company, "financial performance")
-        self._add_step("rag_query", {
-            "query": f"Financial performance of {company}",
-            "results": financial_info,
-            "usage": "Used to analyze financial health and trends"
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing company profile of {company}",
-            "insights": "Company has a strong market position and global presence."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing news about {company}",
-            "insights": "Recent news indicates strategic growth initiatives and positive market reception."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing product portfolio of {company}",
-            "insights": "Product lineup shows innovation focus with regular updates and feature additions."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing financial performance of {company}",
-            "insights": "Financial indicators suggest strong performance with consistent growth."
-        })
+        rag_results = self._query_rag_service_batch(company, ("products and services", "financial performance"))
+        product_info = rag_results["products and services"]
+        financial_info = rag_results["financial performance"]
+        
+        self._add_steps_bulk([
+            ("rag_query", {
+                "query": f"Products and services of {company}",
+                "results": product_info,
+                "usage": "Used to analyze product portfolio"
+            }),
+            ("rag_query", {
+                "query": f"Financial performance of {company}",
+                "results": financial_info,
+                "usage": "Used to analyze financial health and trends"
+            })
+        ] + [
+            ("analysis", {"thought": thought.format(company=company), "insights": insights})
+            for thought, insights in _ANALYSIS_TEMPLATES
+        ])
         
         self._update_token_usage(450)
         
-        time.sleep(1.0)
+        if self.simulate_latency:
+            time.sleep(1.0)
     
     def _simulate_report_node(self, company: str) -> None:
         """
@@ -179,7 +242,8 @@ class LangGraphRunner(AgentRunner):
         
         self._update_token_usage(400)
         
-        time.sleep(0.7)
+        if self.simulate_latency:
+            time.sleep(0.7)
     
     def _query_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
         """
@@ -192,40 +256,142 @@ class LangGraphRunner(AgentRunner):
         Returns:
             List of relevant documents
         """
+        cached = self._rag_cache.get(company, aspect)
+        if cached is not None:
+            self._update_token_usage(100)
+            return cached
+        
+        if not self._rag_breaker.allow(self.rag_service_url):
+            return self._generate_placeholder_results(company, aspect)
+        
         try:
             query = f"{company} {aspect}"
             
             # Call RAG service
-            response = requests.get(
+            response = self.session.get(
                 f"{self.rag_service_url}/query",
-                params={"q": query, "top_k": 3}
+                params={"q": query, "top_k": 3},
+                timeout=(1.0, 5.0)
             )
             
             if response.status_code == 200:
-                data = response.json()
-                
-                results = []
-                for result in data.get("results", []):
-                    results.append({
-                        "text": result.get("chunk", ""),
-                        "metadata": result.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    })
+                self._rag_breaker.record_success(self.rag_service_url)
+                data = orjson.loads(response.content)
                 
-                if not results:
-                    results = self._generate_placeholder_results(company, aspect)
+                results = self._convert_results(company, aspect, data.get("results", []))
                 
                 self._update_token_usage(100)
                 
                 return results
             else:
-                logger.warning(f"RAG service returned status code {response.status_code}")
+                logger.warning("RAG service returned status code %s", response.status_code)
+                self._rag_breaker.record_failure(self.rag_service_url)
                 return self._generate_placeholder_results(company, aspect)
                 
         except Exception as e:
-            logger.error(f"Error querying RAG service: {str(e)}")
+            logger.error("Error querying RAG service: %s", e)
+            self._rag_breaker.record_failure(self.rag_service_url)
             return self._generate_placeholder_results(company, aspect)
     
+    def _query_rag_service_batch(self, company: str, aspects: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Query the RAG service for several aspects in one /query_batch request.
+        
+        Cached aspects are not re-queried. Falls back to one query per aspect
+        when the service has no batch endpoint.
+        
+        Args:
+            company: Company name to research
+            aspects: Aspects to research, one query each
+            
+        Returns:
+            Dictionary mapping each aspect to its list of relevant documents
+        """
+        results = {}
+        missing = []
+        for aspect in aspects:
+            cached = self._rag_cache.get(company, aspect)
+            if cached is None:
+                missing.append(aspect)
+            else:
+                results[aspect] = cached
+        
+        answered = len(aspects) - len(missing)
+        
+        if missing:
+            response = None
+            # While the service keeps failing, fall straight back to placeholders
+            if self._batch_supported and self._rag_breaker.allow(self.rag_service_url):
+                try:
+                    response = self.session.post(
+                        f"{self.rag_service_url}/query_batch",
+                        json={"queries": [{"q": f"{company} {aspect}", "top_k": 3} for aspect in missing]},
+                        timeout=(1.0, 5.0)
+                    )
+                except Exception as e:
+                    logger.error("Error querying RAG service: %s", e)
+                    self._rag_breaker.record_failure(self.rag_service_url)
+            
+            if response is not None and response.status_code in (404, 405):
+                # Older RAG services only expose /query; stop trying the batch endpoint
+                self._batch_supported = False
+            
+            if not self._batch_supported:
+                # /query counts its own tokens; the per-aspect queries are
+                # independent, so overlap their round trips
+                with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                    results.update(zip(missing, executor.map(
+                        lambda aspect: self._query_rag_service(company, aspect), missing
+                    )))
+                self._update_token_usage(100 * answered)
+                return {aspect: results[aspect] for aspect in aspects}
+            
+            responses = []
+            if response is not None:
+                if response.status_code == 200:
+                    try:
+                        responses = batch_results(response.content)
+                    except ValueError as e:
+                        logger.error("Malformed RAG service batch response: %s", e)
+                        self._rag_breaker.record_failure(self.rag_service_url)
+                    else:
+                        self._rag_breaker.record_success(self.rag_service_url)
+                else:
+                    self._rag_breaker.record_failure(self.rag_service_url)
+                    logger.warning("RAG service returned status code %s", response.status_code)
+            
+            for n, aspect in enumerate(missing):
+                raw_results = responses[n] if n < len(responses) else []
+                results[aspect] = self._convert_results(company, aspect, raw_results)
+            
+            # Only aspects the service actually answered are charged, as in _query_rag_service
+            answered += min(len(responses), len(missing))
+        
+        self._update_token_usage(100 * answered)
+        
+        return {aspect: results[aspect] for aspect in aspects}
+    
+    def _convert_results(self, company: str, aspect: str, raw_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert RAG service results, caching them or falling back to placeholders.
+        
+        Args:
+            company: Company name
+            aspect: Research aspect
+            raw_results: Results as returned by the RAG service
+            
+        Returns:
+            List of relevant documents
+        """
+        results = to_documents(raw_results)
+        
+        if not results:
+            return self._generate_placeholder_results(company, aspect)
+        
+        self._rag_cache.set(company, aspect, results)
+        
+        return results
+    
     def _generate_placeholder_results(self, company: str, aspect: str) -> List[Dict[str, Any]]:
         """
         Generate placeholder results when RAG service is unavailable.
@@ -237,36 +403,7 @@ class LangGraphRunner(AgentRunner):
         Returns:
             List of placeholder results
         """
-        if aspect == "company profile":
-            return [{
-                "text": f"{company} is a leading global corporation with a diverse portfolio of products and services, operating in multiple markets worldwide.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.96
-            }]
-        elif aspect == "latest news":
-            return [{
-                "text": f"{company} has recently announced a strategic partnership to enhance its product offerings and expand into new markets.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.93
-            }]
-        elif aspect == "products and services":
-            return [{
-                "text": f"{company}'s product lineup includes cutting-edge solutions that have received industry recognition for innovation and quality.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.91
-            }]
-        elif aspect == "financial performance":
-            return [{
-                "text": f"{company} reported strong quarterly results with revenue growth of 12% year-over-year and improved profit margins.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.94
-            }]
-        else:
-            return [{
-                "text": f"Information about {company} related to {aspect}.",
-                "metadata": {"source": "simulated", "relevance": "medium"},
-                "score": 0.80
-            }]
+        return placeholder_results(_PLACEHOLDERS, _DEFAULT_PLACEHOLDER, company, aspect)
     
     def _generate_report(self, company: str) -> str:
         """
@@ -279,27 +416,11 @@ class LangGraphRunner(AgentRunner):
             Final report text
         """
         
-        report = f"""# {company} Research Report
-
-{company} is a leading global corporation with a diverse portfolio of products and services, operating in multiple markets worldwide.
-
-{company} has recently announced a strategic partnership to enhance its product offerings and expand into new markets.
-
-{company}'s product lineup includes cutting-edge solutions that have received industry recognition for innovation and quality.
-
-{company} reported strong quarterly results with revenue growth of 12% year-over-year and improved profit margins.
-
-Based on our graph-based analysis, {company} demonstrates strong market positioning with innovative products and solid financial performance. The company has shown consistent growth and strategic initiatives that position it well for future success.
-
-- Strong global presence and brand recognition
-- Strategic partnerships driving growth
-- Innovative product portfolio with industry recognition
-- Consistent financial performance with healthy margins
-"""
+        report = _REPORT_TMPL.format(company=company)
         
         self._add_step("report_generation", {
             "thought": f"Generating comprehensive report for {company}",
-            "report_sections": ["Company Profile", "Latest News", "Products and Market Position", "Financial Performance", "Summary Analysis", "Key Insights"]
+            "report_sections": list(_REPORT_SECTIONS)
         })
         
         return report
@@ -9,79 +9,155 @@ import os
 import time
 import json
 import logging
-import requests
 import importlib.util
+import queue
 import subprocess
 import sys
-import tempfile
-from typing import Dict, List, Any, Optional
+import threading
+import orjson
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from agents.base_agent_runner import AsyncRAGAgentRunner
+from agents.common.rag_cache import RAGCache
+
 logger = logging.getLogger(__name__)
 
-# Check if Portia SDK is available
+# Portia SDK availability, resolved by _ensure_portia() on first runner construction
 PORTIA_AVAILABLE = False
 PORTIA_VENV_PATH = None
+_portia_state: Optional[Tuple[bool, Optional[Path]]] = None
+_portia_lock = threading.Lock()
+
+# Seconds to wait for the Portia worker to answer a request before restarting it
+PORTIA_WORKER_TIMEOUT = 30.0
+
 
-try:
-    if importlib.util.find_spec("portia") is not None:
+def _ensure_portia() -> Tuple[bool, Optional[Path]]:
+    """
+    Check whether the Portia SDK is available, setting it up on first use.
+    
+    If the SDK cannot be imported next to the benchmark's dependencies because
+    of a LangGraph version conflict, it is installed in a separate virtual
+    environment instead. This can take a while, so it is deferred from module
+    import to the first runner construction and only done once per process.
+    
+    Returns:
+        Tuple of whether the SDK is available and the path of its separate
+        virtual environment, if one is used
+    """
+    global _portia_state, PORTIA_AVAILABLE, PORTIA_VENV_PATH
+    global PortiaClient, KnowledgeGraph, Entity, Relation
+    
+    with _portia_lock:
+        if _portia_state is not None:
+            return _portia_state
+        
         try:
-            from portia import PortiaClient, KnowledgeGraph, Entity, Relation
-            PORTIA_AVAILABLE = True
-            logger.info("Portia SDK loaded successfully via direct import")
-        except ImportError as e:
-            if "langgraph" in str(e):
-                logger.warning(f"LangGraph version conflict detected: {str(e)}")
-                
-                current_file = Path(__file__)
-                project_root = current_file.parent.parent.parent.absolute()
-                
-                portia_req_path = project_root / "requirements-portia.txt"
-                
-                if portia_req_path.exists():
-                    try:
-                        PORTIA_VENV_PATH = project_root / ".venv-portia"
-                        
-                        if not PORTIA_VENV_PATH.exists():
-                            logger.info(f"Creating virtual environment for Portia SDK at {PORTIA_VENV_PATH}")
-                            subprocess.check_call([sys.executable, "-m", "venv", str(PORTIA_VENV_PATH)])
+            if importlib.util.find_spec("portia") is not None:
+                try:
+                    from portia import PortiaClient, KnowledgeGraph, Entity, Relation
+                    PORTIA_AVAILABLE = True
+                    logger.info("Portia SDK loaded successfully via direct import")
+                except ImportError as e:
+                    if "langgraph" in str(e):
+                        logger.warning("LangGraph version conflict detected: %s", e)
                         
-                        if os.name == 'nt':  # Windows
-                            pip_path = PORTIA_VENV_PATH / "Scripts" / "pip"
-                        else:  # Unix/Linux/Mac
-                            pip_path = PORTIA_VENV_PATH / "bin" / "pip"
+                        current_file = Path(__file__)
+                        project_root = current_file.parent.parent.parent.absolute()
                         
-                        logger.info(f"Installing Portia SDK requirements from {portia_req_path}")
-                        subprocess.check_call([str(pip_path), "install", "-r", str(portia_req_path)])
+                        portia_req_path = project_root / "requirements-portia.txt"
                         
-                        PORTIA_AVAILABLE = True
-                        logger.info("Portia SDK installed in separate environment")
-                    except subprocess.CalledProcessError as e:
-                        logger.error(f"Failed to install Portia SDK: {str(e)}")
+                        if portia_req_path.exists():
+                            try:
+                                PORTIA_VENV_PATH = project_root / ".venv-portia"
+                                
+                                if not PORTIA_VENV_PATH.exists():
+                                    logger.info("Creating virtual environment for Portia SDK at %s", PORTIA_VENV_PATH)
+                                    subprocess.check_call([sys.executable, "-m", "venv", str(PORTIA_VENV_PATH)])
+                                
+                                if os.name == 'nt':  # Windows
+                                    pip_path = PORTIA_VENV_PATH / "Scripts" / "pip"
+                                else:  # Unix/Linux/Mac
+                                    pip_path = PORTIA_VENV_PATH / "bin" / "pip"
+                                
+                                logger.info("Installing Portia SDK requirements from %s", portia_req_path)
+                                subprocess.check_call([str(pip_path), "install", "-r", str(portia_req_path)])
+                                
+                                PORTIA_AVAILABLE = True
+                                logger.info("Portia SDK installed in separate environment")
+                            except subprocess.CalledProcessError as e:
+                                logger.error("Failed to install Portia SDK: %s", e)
+                    else:
+                        logger.warning("Error importing Portia SDK: %s", e)
             else:
-                logger.warning(f"Error importing Portia SDK: {str(e)}")
-    else:
-        logger.warning("Portia SDK not available. Using fallback implementation.")
-except Exception as e:
-    logger.warning(f"Error checking for Portia SDK: {str(e)}")
-    logger.warning("Using fallback implementation.")
-
-from agents.base_agent_runner import AgentRunner
+                logger.warning("Portia SDK not available. Using fallback implementation.")
+        except Exception as e:
+            logger.warning("Error checking for Portia SDK: %s", e)
+            logger.warning("Using fallback implementation.")
+        
+        _portia_state = (PORTIA_AVAILABLE, PORTIA_VENV_PATH)
+        return _portia_state
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-class PortiaAIRunner(AgentRunner):
+RAG_ASPECTS = ("company profile", "recent news", "products and services", "market analysis")
+
+# Placeholder (text template, score, relevance) per aspect when the RAG service has no results
+_PLACEHOLDERS = {
+    "company profile": ("{company} is a notable entity in its industry, with a strong emphasis on innovation and customer-centric solutions.", 0.94, "high"),
+    "recent news": ("{company} has recently announced a significant initiative focused on sustainability and long-term growth strategies.", 0.91, "high"),
+    "products and services": ("{company}'s portfolio includes a range of cutting-edge products and services that address key market needs and provide significant value to customers.", 0.89, "high"),
+    "market analysis": ("{company} holds a competitive position in the market, with distinct advantages in technology innovation and customer loyalty.", 0.93, "high")
+}
+_DEFAULT_PLACEHOLDER = ("Information about {company} related to {aspect}.", 0.78, "medium")
+
+_PLAN_TEMPLATES = (
+    "1. Gather foundational information about {company}",
+    "2. Collect recent news and developments",
+    "3. Research product portfolio and service offerings",
+    "4. Analyze market position and competitive landscape",
+    "5. Generate a knowledge graph of entities and relationships",
+    "6. Synthesize information into a comprehensive report"
+)
+
+# Fixed report text; only the company name and retrieved passages vary per task
+_REPORT_TMPL = """# {company} Research Report
+
+{company_text}
+
+{news_text}
+
+{product_text}
+
+{market_text}
+
+Based on our knowledge graph analysis, {company} demonstrates strong interconnectivity between its product offerings and market positioning. The entity relationships reveal strategic alignment between corporate initiatives and industry trends.
+
+Our analysis identified key strengths in innovation capability, market responsiveness, and strategic vision. The knowledge graph highlights potential growth opportunities in emerging market segments and technology integration.
+"""
+_REPORT_SECTIONS = ("Company Profile", "Recent Developments", "Products and Services", "Market Analysis", "Knowledge Graph Insights")
+
+# (subject, insights) for each knowledge graph analysis step
+_ANALYSIS_INSIGHTS = (
+    ("company profile information", "Entity shows strong fundamentals with consistent growth trajectory."),
+    ("recent developments", "Recent initiatives align with long-term strategic goals and market trends."),
+    ("product ecosystem", "Product portfolio demonstrates innovation focus with regular enhancements."),
+    ("market position", "Company maintains competitive advantage through technology differentiation and customer experience.")
+)
+
+class PortiaAIRunner(AsyncRAGAgentRunner):
     """
     Implementation of the AgentRunner for Portia AI.
     
     This agent is tasked with researching a given company using the Portia AI framework,
     which specializes in building and analyzing knowledge graphs from retrieved information.
+    RAG results are cached per (company, aspect) across runner instances; set
+    RAG_CACHE_PATH to also persist them in a SQLite file. The simulated planning,
+    analysis and reporting delays can be disabled by setting AGENT_SIMULATE_LATENCY to 0.
     
     Attributes:
         agent_name (str): Name of the agent framework ("portiaai")
@@ -89,6 +165,11 @@ class PortiaAIRunner(AgentRunner):
         portia_client: Portia SDK client for interacting with knowledge graphs
     """
     
+    _rag_cache = RAGCache(os.getenv("RAG_CACHE_PATH") or None, namespace="portiaai")
+    _placeholders = _PLACEHOLDERS
+    _default_placeholder = _DEFAULT_PLACEHOLDER
+    _rag_query_tokens = 120
+    
     def __init__(self, rag_service_url: str):
         """
         Initialize the Portia AI runner.
@@ -97,10 +178,15 @@ class PortiaAIRunner(AgentRunner):
             rag_service_url: URL of the RAG service
         """
         super().__init__("portiaai", rag_service_url)
+        _ensure_portia()
         
         # Initialize Portia SDK client if available via direct import
         self.portia_client = None
         self.knowledge_graph = None
+        self._portia_worker = None
+        self._portia_replies: Optional[queue.Queue] = None
+        # One request/response exchange with the worker at a time
+        self._portia_worker_lock = threading.Lock()
         
         if PORTIA_AVAILABLE and not PORTIA_VENV_PATH:
             try:
@@ -112,10 +198,100 @@ class PortiaAIRunner(AgentRunner):
                 
                 self.knowledge_graph = KnowledgeGraph(name="default-research")
             except Exception as e:
-                logger.error(f"Failed to initialize Portia SDK client: {str(e)}")
+                logger.error("Failed to initialize Portia SDK client: %s", e)
         elif PORTIA_VENV_PATH:
             logger.info("Using Portia SDK in separate virtual environment")
         
+    def close(self) -> None:
+        """
+        Stop the Portia worker process and close the RAG client.
+        """
+        self._stop_portia_worker()
+        super().close()
+    
+    def _call_portia_worker(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a request to the Portia worker in the separate virtual environment.
+        
+        The worker is started on first use and kept running for the lifetime
+        of the runner, so the SDK is only imported once. A worker that does
+        not answer within PORTIA_WORKER_TIMEOUT seconds is killed, and the
+        next request starts a new one.
+        
+        Args:
+            request: Request for the worker
+            
+        Returns:
+            The worker's response
+            
+        Raises:
+            TimeoutError: If the worker does not answer in time
+        """
+        with self._portia_worker_lock:
+            if self._portia_worker is None or self._portia_worker.poll() is not None:
+                self._start_portia_worker()
+            
+            self._portia_worker.stdin.write(orjson.dumps(request) + b"\n")
+            self._portia_worker.stdin.flush()
+            try:
+                line = self._portia_replies.get(timeout=PORTIA_WORKER_TIMEOUT)
+            except queue.Empty:
+                worker, self._portia_worker = self._portia_worker, None
+                worker.kill()
+                worker.stdin.close()
+                raise TimeoutError(f"Portia worker did not respond within {PORTIA_WORKER_TIMEOUT} seconds")
+        
+        if not line:
+            raise RuntimeError("Portia worker exited without responding")
+        
+        response = orjson.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+    
+    def _start_portia_worker(self) -> None:
+        """
+        Start the Portia worker and a thread that queues its response lines.
+        
+        Must be called with the worker lock held.
+        """
+        if os.name == 'nt':  # Windows
+            python_path = PORTIA_VENV_PATH / "Scripts" / "python"
+        else:  # Unix/Linux/Mac
+            python_path = PORTIA_VENV_PATH / "bin" / "python"
+        
+        self._portia_worker = subprocess.Popen(
+            [str(python_path), str(Path(__file__).parent / "worker.py")],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+        
+        # Responses are read in the background so a wedged worker cannot block
+        # the caller past the timeout; an empty line marks the end of output
+        self._portia_replies = replies = queue.Queue()
+        stdout = self._portia_worker.stdout
+        
+        def read_replies() -> None:
+            for line in iter(stdout.readline, b""):
+                replies.put(line)
+            replies.put(b"")
+        
+        threading.Thread(target=read_replies, name="portia-worker-reader", daemon=True).start()
+    
+    def _stop_portia_worker(self) -> None:
+        """
+        Stop the Portia worker process if it is running.
+        """
+        with self._portia_worker_lock:
+            worker, self._portia_worker = self._portia_worker, None
+        if worker is None:
+            return
+        
+        try:
+            worker.stdin.close()
+            worker.wait(timeout=5)
+        except Exception:
+            worker.kill()
         
     def run_task(self, topic: str) -> Dict[str, Any]:
         """
@@ -137,33 +313,30 @@ class PortiaAIRunner(AgentRunner):
         else:
             self._simulate_research_planning(topic)
         
-        company_info = self._query_rag_service(topic, "company profile")
-        self._add_step("rag_query", {
-            "query": f"Company profile for {topic}",
-            "results": company_info,
-            "usage": "Used to gather general company information"
-        })
-        
-        news_info = self._query_rag_service(topic, "recent news")
-        self._add_step("rag_query", {
-            "query": f"Recent news about {topic}",
-            "results": news_info,
-            "usage": "Used to gather recent news about the company"
-        })
-        
-        product_info = self._query_rag_service(topic, "products and services")
-        self._add_step("rag_query", {
-            "query": f"Products and services of {topic}",
-            "results": product_info,
-            "usage": "Used to gather information about company products"
-        })
-        
-        market_info = self._query_rag_service(topic, "market analysis")
-        self._add_step("rag_query", {
-            "query": f"Market analysis for {topic}",
-            "results": market_info,
-            "usage": "Used to analyze market position and competition"
-        })
+        company_info, news_info, product_info, market_info = self._run_rag_queries(topic, RAG_ASPECTS)
+        
+        self._add_steps_bulk([
+            ("rag_query", {
+                "query": f"Company profile for {topic}",
+                "results": company_info,
+                "usage": "Used to gather general company information"
+            }),
+            ("rag_query", {
+                "query": f"Recent news about {topic}",
+                "results": news_info,
+                "usage": "Used to gather recent news about the company"
+            }),
+            ("rag_query", {
+                "query": f"Products and services of {topic}",
+                "results": product_info,
+                "usage": "Used to gather information about company products"
+            }),
+            ("rag_query", {
+                "query": f"Market analysis for {topic}",
+                "results": market_info,
+                "usage": "Used to analyze market position and competition"
+            })
+        ])
         
         if self.portia_client and PORTIA_AVAILABLE:
             self._build_knowledge_graph(topic, company_info, news_info, product_info, market_info)
@@ -193,7 +366,7 @@ class PortiaAIRunner(AgentRunner):
                 self._simulate_research_planning(company)
                 return
                 
-            logger.info(f"Planning research approach for {company} using Portia AI")
+            logger.info("Planning research approach for %s using Portia AI", company)
             
             self.knowledge_graph = KnowledgeGraph(name=f"{company}-research")
             
@@ -204,14 +377,7 @@ class PortiaAIRunner(AgentRunner):
                         f"recent news, products and services, and market analysis."
             )
             
-            plan_steps = [
-                f"1. Gather foundational information about {company}",
-                f"2. Collect recent news and developments",
-                f"3. Research product portfolio and service offerings",
-                f"4. Analyze market position and competitive landscape",
-                f"5. Generate a knowledge graph of entities and relationships",
-                f"6. Synthesize information into a comprehensive report"
-            ]
+            plan_steps = [step.format(company=company) for step in _PLAN_TEMPLATES]
             
             if plan and hasattr(plan, 'steps') and plan.steps:
                 plan_steps = [f"{i+1}. {step}" for i, step in enumerate(plan.steps)]
@@ -224,7 +390,7 @@ class PortiaAIRunner(AgentRunner):
             self._update_token_usage(300)
             
         except Exception as e:
-            logger.error(f"Error in Portia AI planning: {str(e)}")
+            logger.error("Error in Portia AI planning: %s", e)
             self._simulate_research_planning(company)
     
     def _simulate_research_planning(self, company: str) -> None:
@@ -239,110 +405,13 @@ class PortiaAIRunner(AgentRunner):
         
         self._add_step("planning", {
             "thought": f"Planning research approach for {company} using knowledge graph",
-            "plan": [
-                f"1. Gather foundational information about {company}",
-                f"2. Collect recent news and developments",
-                f"3. Research product portfolio and service offerings",
-                f"4. Analyze market position and competitive landscape",
-                f"5. Generate a knowledge graph of entities and relationships",
-                f"6. Synthesize information into a comprehensive report"
-            ]
+            "plan": [step.format(company=company) for step in _PLAN_TEMPLATES]
         })
         
         self._update_token_usage(280)
         
-        time.sleep(0.6)
-    
-    def _query_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Query the RAG service for company information.
-        
-        This method retrieves relevant information from the RAG service
-        based on the company name and specific aspect to research.
-        
-        Args:
-            company: Company name to research
-            aspect: Specific aspect to research (e.g., "company profile")
-            
-        Returns:
-            List of relevant documents
-        """
-        try:
-            query = f"{company} {aspect}"
-            
-            response = requests.get(
-                f"{self.rag_service_url}/query",
-                params={"q": query, "top_k": 3}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                results = []
-                for result in data.get("results", []):
-                    results.append({
-                        "text": result.get("chunk", ""),
-                        "metadata": result.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    })
-                
-                if not results:
-                    results = self._generate_placeholder_results(company, aspect)
-                
-                self._update_token_usage(120)
-                
-                return results
-            else:
-                logger.warning(f"RAG service returned status code {response.status_code}")
-                return self._generate_placeholder_results(company, aspect)
-                
-        except Exception as e:
-            logger.error(f"Error querying RAG service: {str(e)}")
-            return self._generate_placeholder_results(company, aspect)
-    
-    def _generate_placeholder_results(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Generate placeholder results when RAG service is unavailable.
-        
-        This method creates simulated results for testing and fallback purposes.
-        
-        Args:
-            company: Company name
-            aspect: Research aspect
-            
-        Returns:
-            List of placeholder results
-        """
-        if aspect == "company profile":
-            return [{
-                "text": f"{company} is a notable entity in its industry, with a strong emphasis on innovation and customer-centric solutions.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.94
-            }]
-        elif aspect == "recent news":
-            return [{
-                "text": f"{company} has recently announced a significant initiative focused on sustainability and long-term growth strategies.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.91
-            }]
-        elif aspect == "products and services":
-            return [{
-                "text": f"{company}'s portfolio includes a range of cutting-edge products and services that address key market needs and provide significant value to customers.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.89
-            }]
-        elif aspect == "market analysis":
-            return [{
-                "text": f"{company} holds a competitive position in the market, with distinct advantages in technology innovation and customer loyalty.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.93
-            }]
-        else:
-            return [{
-                "text": f"Information about {company} related to {aspect}.",
-                "metadata": {"source": "simulated", "relevance": "medium"},
-                "score": 0.78
-            }]
+        if self.simulate_latency:
+            time.sleep(0.6)
     
     def _build_knowledge_graph(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                                   product_info: List[Dict], market_info: List[Dict]) -> None:
@@ -364,7 +433,7 @@ class PortiaAIRunner(AgentRunner):
                 self._simulate_knowledge_graph_analysis(company, company_info, news_info, product_info, market_info)
                 return
                 
-            logger.info(f"Building knowledge graph for {company} using Portia AI")
+            logger.info("Building knowledge graph for %s using Portia AI", company)
             
             if self.portia_client and not PORTIA_VENV_PATH:
                 # Extract entities and relationships from the retrieved information
@@ -413,114 +482,16 @@ class PortiaAIRunner(AgentRunner):
                 try:
                     self.portia_client.knowledge_graphs.save(self.knowledge_graph)
                 except Exception as e:
-                    logger.warning(f"Error saving knowledge graph: {str(e)}")
+                    logger.warning("Error saving knowledge graph: %s", e)
             
             elif PORTIA_VENV_PATH:
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                    script_path = f.name
-                    f.write(f"""
-import os
-import json
-from portia import PortiaClient, KnowledgeGraph, Entity, Relation
-
-# Initialize Portia client
-client = PortiaClient(
-    api_key=os.environ.get("PORTIA_API_KEY"),
-    base_url=os.environ.get("PORTIA_API_URL", "https://api.portia.ai")
-)
-
-kg = KnowledgeGraph(name="{company}-research")
-
-company_entity = Entity(
-    type="Company",
-    name="{company}",
-    attributes={{"industry": "Technology", "founded": "2005"}}
-)
-kg.add_entity(company_entity)
-
-product_name = "{company} Flagship Product"
-product_entity = Entity(
-    type="Product",
-    name=product_name,
-    attributes={{"launched": "2020"}}
-)
-kg.add_entity(product_entity)
-
-relation = Relation(
-    source="{company}",
-    relation="OFFERS",
-    target=product_name
-)
-kg.add_relation(relation)
-
-market_entity = Entity(
-    type="Market",
-    name="Global Market",
-    attributes={{"size": "$500B"}}
-)
-kg.add_entity(market_entity)
-
-market_relation = Relation(
-    source="{company}",
-    relation="COMPETES_IN",
-    target="Global Market"
-)
-kg.add_relation(market_relation)
-
-try:
-    client.knowledge_graphs.save(kg)
-    print("Knowledge graph saved successfully")
-except Exception as e:
-    print(f"Error saving knowledge graph: {{str(e)}}")
-
-result = {{
-    "entities": [
-        {{"type": "Company", "name": "{company}", "attributes": {{"industry": "Technology", "founded": "2005"}}}},
-        {{"type": "Product", "name": "{company} Flagship Product", "attributes": {{"launched": "2020"}}}},
-        {{"type": "Market", "name": "Global Market", "attributes": {{"size": "$500B"}}}}
-    ],
-    "relations": [
-        {{"source": "{company}", "relation": "OFFERS", "target": "{company} Flagship Product"}},
-        {{"source": "{company}", "relation": "COMPETES_IN", "target": "Global Market"}}
-    ]
-}}
-
-print(json.dumps(result))
-""")
-                
                 try:
-                    if os.name == 'nt':  # Windows
-                        python_path = PORTIA_VENV_PATH / "Scripts" / "python"
-                    else:  # Unix/Linux/Mac
-                        python_path = PORTIA_VENV_PATH / "bin" / "python"
-                    
-                    env = os.environ.copy()
-                    if os.getenv("PORTIA_API_KEY"):
-                        env["PORTIA_API_KEY"] = os.getenv("PORTIA_API_KEY")
-                    if os.getenv("PORTIA_API_URL"):
-                        env["PORTIA_API_URL"] = os.getenv("PORTIA_API_URL")
-                    
-                    result = subprocess.check_output([str(python_path), script_path], env=env)
-                    result_data = json.loads(result.decode('utf-8').strip())
-                    
-                    os.unlink(script_path)
+                    self._call_portia_worker({"op": "build_kg", "company": company})
                     
                     logger.info("Successfully built knowledge graph using virtual environment")
                 except Exception as e:
-                    logger.error(f"Error running Portia script in virtual environment: {str(e)}")
-                    if os.path.exists(script_path):
-                        os.unlink(script_path)
-                    result_data = {
-                        "entities": [
-                            {"type": "Company", "name": company, "attributes": {"industry": "Technology", "founded": "2005"}},
-                            {"type": "Product", "name": f"{company} Flagship Product", "attributes": {"launched": "2020"}},
-                            {"type": "Market", "name": "Global Market", "attributes": {"size": "$500B"}}
-                        ],
-                        "relations": [
-                            {"source": company, "relation": "OFFERS", "target": f"{company} Flagship Product"},
-                            {"source": company, "relation": "COMPETES_IN", "target": "Global Market"}
-                        ]
-                    }
+                    logger.error("Error running Portia worker in virtual environment: %s", e)
+                    self._stop_portia_worker()
             
             self._add_step("knowledge_graph", {
                 "thought": f"Building knowledge graph for {company} using Portia AI",
@@ -538,7 +509,7 @@ print(json.dumps(result))
             self._analyze_knowledge_graph(company)
             
         except Exception as e:
-            logger.error(f"Error in Portia AI knowledge graph building: {str(e)}")
+            logger.error("Error in Portia AI knowledge graph building: %s", e)
             self._simulate_knowledge_graph_analysis(company, company_info, news_info, product_info, market_info)
     
     def _analyze_knowledge_graph(self, company: str) -> None:
@@ -554,30 +525,15 @@ print(json.dumps(result))
                 
             # In a real implementation, we would use Portia's analysis capabilities
             
-            self._add_step("analysis", {
-                "thought": f"Analyzing company profile information using Portia AI",
-                "insights": "Entity shows strong fundamentals with consistent growth trajectory."
-            })
-            
-            self._add_step("analysis", {
-                "thought": f"Analyzing recent developments using Portia AI",
-                "insights": "Recent initiatives align with long-term strategic goals and market trends."
-            })
-            
-            self._add_step("analysis", {
-                "thought": f"Analyzing product ecosystem using Portia AI",
-                "insights": "Product portfolio demonstrates innovation focus with regular enhancements."
-            })
-            
-            self._add_step("analysis", {
-                "thought": f"Analyzing market position using Portia AI",
-                "insights": "Company maintains competitive advantage through technology differentiation and customer experience."
-            })
+            self._add_steps_bulk([
+                ("analysis", {"thought": f"Analyzing {subject} using Portia AI", "insights": insights})
+                for subject, insights in _ANALYSIS_INSIGHTS
+            ])
             
             self._update_token_usage(600)
             
         except Exception as e:
-            logger.error(f"Error in Portia AI knowledge graph analysis: {str(e)}")
+            logger.error("Error in Portia AI knowledge graph analysis: %s", e)
     
     def _simulate_knowledge_graph_analysis(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                                          product_info: List[Dict], market_info: List[Dict]) -> None:
@@ -594,42 +550,28 @@ print(json.dumps(result))
             market_info: Market information
         """
         
-        self._add_step("knowledge_graph", {
-            "thought": f"Building knowledge graph for {company}",
-            "entities": [
-                {"type": "Company", "name": company, "attributes": {"industry": "Technology", "founded": "2005"}},
-                {"type": "Product", "name": f"{company} Flagship Product", "attributes": {"launched": "2020"}},
-                {"type": "Market", "name": "Global Market", "attributes": {"size": "$500B"}}
-            ],
-            "relations": [
-                {"source": company, "relation": "OFFERS", "target": f"{company} Flagship Product"},
-                {"source": company, "relation": "COMPETES_IN", "target": "Global Market"}
-            ]
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing company profile information",
-            "insights": "Entity shows strong fundamentals with consistent growth trajectory."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing recent developments",
-            "insights": "Recent initiatives align with long-term strategic goals and market trends."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing product ecosystem",
-            "insights": "Product portfolio demonstrates innovation focus with regular enhancements."
-        })
-        
-        self._add_step("analysis", {
-            "thought": f"Analyzing market position",
-            "insights": "Company maintains competitive advantage through technology differentiation and customer experience."
-        })
+        self._add_steps_bulk([
+            ("knowledge_graph", {
+                "thought": f"Building knowledge graph for {company}",
+                "entities": [
+                    {"type": "Company", "name": company, "attributes": {"industry": "Technology", "founded": "2005"}},
+                    {"type": "Product", "name": f"{company} Flagship Product", "attributes": {"launched": "2020"}},
+                    {"type": "Market", "name": "Global Market", "attributes": {"size": "$500B"}}
+                ],
+                "relations": [
+                    {"source": company, "relation": "OFFERS", "target": f"{company} Flagship Product"},
+                    {"source": company, "relation": "COMPETES_IN", "target": "Global Market"}
+                ]
+            })
+        ] + [
+            ("analysis", {"thought": f"Analyzing {subject}", "insights": insights})
+            for subject, insights in _ANALYSIS_INSIGHTS
+        ])
         
         self._update_token_usage(550)
         
-        time.sleep(1.2)
+        if self.simulate_latency:
+            time.sleep(1.2)
     
     def _generate_report(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                         product_info: List[Dict], market_info: List[Dict]) -> str:
@@ -650,48 +592,39 @@ print(json.dumps(result))
             Final report text
         """
         
-        company_text = company_info[0]["text"] if company_info else ""
-        news_text = news_info[0]["text"] if news_info else ""
-        product_text = product_info[0]["text"] if product_info else ""
-        market_text = market_info[0]["text"] if market_info else ""
-        
-        report = f"""# {company} Research Report
-
-{company_text}
-
-{news_text}
-
-{product_text}
-
-{market_text}
-
-Based on our knowledge graph analysis, {company} demonstrates strong interconnectivity between its product offerings and market positioning. The entity relationships reveal strategic alignment between corporate initiatives and industry trends.
-
-Our analysis identified key strengths in innovation capability, market responsiveness, and strategic vision. The knowledge graph highlights potential growth opportunities in emerging market segments and technology integration.
-"""
+        report = _REPORT_TMPL.format(
+            company=company,
+            company_text=company_info[0]["text"] if company_info else "",
+            news_text=news_info[0]["text"] if news_info else "",
+            product_text=product_info[0]["text"] if product_info else "",
+            market_text=market_info[0]["text"] if market_info else ""
+        )
         
         self._add_step("report_generation", {
             "thought": f"Generating comprehensive report for {company}",
-            "report_sections": ["Company Profile", "Recent Developments", "Products and Services", "Market Analysis", "Knowledge Graph Insights"]
+            "report_sections": list(_REPORT_SECTIONS)
         })
         
         self._update_token_usage(400)
         
-        time.sleep(0.8)
+        if self.simulate_latency:
+            time.sleep(0.8)
         
         return report
 
 
 if __name__ == "__main__":
-    import os
-    from dotenv import load_dotenv
-    
-    load_dotenv()
-    
+    # .env was already loaded when the module was imported
     rag_service_url = f"http://{os.getenv('RAG_SERVICE_HOST', 'localhost')}:{os.getenv('RAG_SERVICE_PORT', '8000')}"
     
     runner = PortiaAIRunner(rag_service_url)
     
-    result = runner.run_task("Apple Inc.")
+    # Several companies are researched in parallel, one runner per worker process
+    companies = sys.argv[1:] or ["Apple Inc."]
+    if len(companies) > 1:
+        results = runner.run_batch(companies)
+    else:
+        results = [runner.run_task(companies[0])]
     
-    print(json.dumps(result, indent=2))
+    for result in results:
+        print(json.dumps(result, indent=2))
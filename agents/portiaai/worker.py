@@ -0,0 +1,79 @@
+"""
+Portia SDK worker for the Portia AI runner.
+
+This script runs inside the separate Portia virtual environment when the SDK
+cannot be imported next to the benchmark's own dependencies. It loads the SDK
+once and then serves requests read from stdin, one JSON object per line,
+writing one JSON response line to stdout for each. It only depends on the
+standard library and the Portia SDK.
+"""
+
+import os
+import sys
+import json
+
+from portia import PortiaClient, KnowledgeGraph, Entity, Relation
+
+
+def build_knowledge_graph(client: "PortiaClient", company: str) -> dict:
+    """
+    Build and save the knowledge graph for a company.
+    
+    Args:
+        client: Portia SDK client
+        company: Company name
+        
+    Returns:
+        Entities and relations added to the graph
+    """
+    product_name = f"{company} Flagship Product"
+    entities = [
+        {"type": "Company", "name": company, "attributes": {"industry": "Technology", "founded": "2005"}},
+        {"type": "Product", "name": product_name, "attributes": {"launched": "2020"}},
+        {"type": "Market", "name": "Global Market", "attributes": {"size": "$500B"}}
+    ]
+    relations = [
+        {"source": company, "relation": "OFFERS", "target": product_name},
+        {"source": company, "relation": "COMPETES_IN", "target": "Global Market"}
+    ]
+    
+    kg = KnowledgeGraph(name=f"{company}-research")
+    for entity in entities:
+        kg.add_entity(Entity(**entity))
+    for relation in relations:
+        kg.add_relation(Relation(**relation))
+    
+    try:
+        client.knowledge_graphs.save(kg)
+    except Exception as e:
+        # stdout carries responses only
+        print(f"Error saving knowledge graph: {e}", file=sys.stderr)
+    
+    return {"entities": entities, "relations": relations}
+
+
+def main() -> None:
+    """
+    Serve requests from stdin until it is closed.
+    """
+    client = PortiaClient(
+        api_key=os.environ.get("PORTIA_API_KEY"),
+        base_url=os.environ.get("PORTIA_API_URL", "https://api.portia.ai")
+    )
+    
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+            if request.get("op") == "build_kg":
+                response = build_knowledge_graph(client, request["company"])
+            else:
+                response = {"error": f"Unknown operation: {request.get('op')}"}
+        except Exception as e:
+            response = {"error": str(e)}
+        
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
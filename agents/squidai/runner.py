@@ -6,24 +6,50 @@ This module implements a company research agent using the SquidAI framework.
 
 import os
 import time
+import asyncio
 import json
 import logging
-import requests
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 
-from agents.base_agent_runner import AgentRunner
+from agents.base_agent_runner import AsyncRAGAgentRunner, _get_rag_loop
+from agents.common.rag_cache import RAGCache
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class SquidAIRunner(AgentRunner):
+# RAG aspect each research tool retrieves
+_TOOL_ASPECTS = {
+    "company_info_tool": "company overview",
+    "news_tool": "latest news",
+    "product_tool": "products and services",
+    "financial_tool": "financial performance"
+}
+
+# Placeholder (text template, score, relevance) per aspect when the RAG service has no results
+_PLACEHOLDERS = {
+    "company overview": ("{company} is a leading organization in its industry, known for innovation and market leadership with a global presence.", 0.97, "high"),
+    "latest news": ("{company} recently announced a strategic partnership and launched several new initiatives focused on sustainable growth and market expansion.", 0.94, "high"),
+    "products and services": ("{company}'s product portfolio includes a wide range of innovative solutions that have received industry recognition for their quality and performance.", 0.92, "high"),
+    "financial performance": ("{company} has demonstrated strong financial performance with consistent revenue growth of 15% year-over-year and expanding profit margins.", 0.95, "high")
+}
+_DEFAULT_PLACEHOLDER = ("Information about {company} related to {aspect}.", 0.82, "medium")
+
+class SquidAIRunner(AsyncRAGAgentRunner):
     """
     Implementation of the AgentRunner for SquidAI.
     
     This agent is tasked with researching a given company using the SquidAI framework.
+    The research tools' RAG queries run concurrently. RAG results are cached per
+    (company, aspect) across runner instances; set RAG_CACHE_PATH to also persist
+    them in a SQLite file. The simulated planning, tool, analysis and reporting
+    delays can be disabled by setting AGENT_SIMULATE_LATENCY to 0.
     """
     
+    _rag_cache = RAGCache(os.getenv("RAG_CACHE_PATH") or None, namespace="squidai")
+    _placeholders = _PLACEHOLDERS
+    _default_placeholder = _DEFAULT_PLACEHOLDER
+    
     def __init__(self, rag_service_url: str):
         """
         Initialize the SquidAI runner.
@@ -63,7 +89,8 @@ class SquidAIRunner(AgentRunner):
         """
         self._simulate_planning(company)
         
-        company_info = self._execute_tool("company_info_tool", company)
+        company_info, news_info, product_info, financial_info = self._execute_tools(company, tuple(_TOOL_ASPECTS))
+        
         self._add_step("tool_execution", {
             "tool": "company_info_tool",
             "input": f"Get information about {company}",
@@ -71,7 +98,6 @@ class SquidAIRunner(AgentRunner):
             "usage": "Used to gather general company information"
         })
         
-        news_info = self._execute_tool("news_tool", company)
         self._add_step("tool_execution", {
             "tool": "news_tool",
             "input": f"Get latest news about {company}",
@@ -79,7 +105,6 @@ class SquidAIRunner(AgentRunner):
             "usage": "Used to gather recent news about the company"
         })
         
-        product_info = self._execute_tool("product_tool", company)
         self._add_step("tool_execution", {
             "tool": "product_tool",
             "input": f"Get product information for {company}",
@@ -87,7 +112,6 @@ class SquidAIRunner(AgentRunner):
             "usage": "Used to gather information about company products"
         })
         
-        financial_info = self._execute_tool("financial_tool", company)
         self._add_step("tool_execution", {
             "tool": "financial_tool",
             "input": f"Get financial data for {company}",
@@ -121,119 +145,46 @@ class SquidAIRunner(AgentRunner):
         
         self._update_token_usage(320)
         
-        time.sleep(0.7)
+        if self.simulate_latency:
+            time.sleep(0.7)
     
-    def _execute_tool(self, tool_name: str, company: str) -> List[Dict[str, Any]]:
+    def _execute_tools(self, company: str, tool_names: Sequence[str]) -> List[List[Dict[str, Any]]]:
         """
-        Simulate the execution of a SquidAI tool.
+        Simulate the execution of several SquidAI tools.
+        
+        The tools run concurrently: their RAG queries are issued together and
+        every tool still pays its own simulated delay, overlapping the others.
         
         Args:
-            tool_name: Name of the tool to execute
             company: Company name to research
+            tool_names: Names of the tools to execute
             
         Returns:
-            Tool execution results
+            Tool execution results, in the same order as tool_names
         """
-        tool_to_aspect = {
-            "company_info_tool": "company overview",
-            "news_tool": "latest news",
-            "product_tool": "products and services",
-            "financial_tool": "financial performance"
-        }
+        aspects = [_TOOL_ASPECTS.get(tool_name, "general information") for tool_name in tool_names]
         
-        aspect = tool_to_aspect.get(tool_name, "general information")
+        future = asyncio.run_coroutine_threadsafe(self._aexecute_tools(company, aspects), _get_rag_loop())
+        results = future.result()
         
-        results = self._query_rag_service(company, aspect)
-        
-        self._update_token_usage(150)
-        
-        time.sleep(0.5)
+        self._update_token_usage(150 * len(tool_names))
         
         return results
     
-    def _query_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
+    async def _aexecute_tools(self, company: str, aspects: Sequence[str]) -> List[List[Dict[str, Any]]]:
         """
-        Query the RAG service for company information.
+        Run the RAG queries and the per-tool delays of a tool batch together.
         
         Args:
             company: Company name to research
-            aspect: Specific aspect to research (e.g., "latest news")
-            
-        Returns:
-            List of relevant documents
-        """
-        try:
-            query = f"{company} {aspect}"
-            
-            response = requests.get(
-                f"{self.rag_service_url}/query",
-                params={"q": query, "top_k": 3}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                results = []
-                for result in data.get("results", []):
-                    results.append({
-                        "text": result.get("chunk", ""),
-                        "metadata": result.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    })
-                
-                if not results:
-                    results = self._generate_placeholder_results(company, aspect)
-                
-                return results
-            else:
-                logger.warning(f"RAG service returned status code {response.status_code}")
-                return self._generate_placeholder_results(company, aspect)
-                
-        except Exception as e:
-            logger.error(f"Error querying RAG service: {str(e)}")
-            return self._generate_placeholder_results(company, aspect)
-    
-    def _generate_placeholder_results(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Generate placeholder results when RAG service is unavailable.
-        
-        Args:
-            company: Company name
-            aspect: Research aspect
+            aspects: Aspects to research, one per tool
             
         Returns:
-            List of placeholder results
+            Tool execution results, in the same order as aspects
         """
-        if aspect == "company overview":
-            return [{
-                "text": f"{company} is a leading organization in its industry, known for innovation and market leadership with a global presence.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.97
-            }]
-        elif aspect == "latest news":
-            return [{
-                "text": f"{company} recently announced a strategic partnership and launched several new initiatives focused on sustainable growth and market expansion.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.94
-            }]
-        elif aspect == "products and services":
-            return [{
-                "text": f"{company}'s product portfolio includes a wide range of innovative solutions that have received industry recognition for their quality and performance.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.92
-            }]
-        elif aspect == "financial performance":
-            return [{
-                "text": f"{company} has demonstrated strong financial performance with consistent revenue growth of 15% year-over-year and expanding profit margins.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.95
-            }]
-        else:
-            return [{
-                "text": f"Information about {company} related to {aspect}.",
-                "metadata": {"source": "simulated", "relevance": "medium"},
-                "score": 0.82
-            }]
+        tool_delays = [asyncio.sleep(0.5) for _ in aspects] if self.simulate_latency else []
+        results, *_ = await asyncio.gather(self._gather_rag_queries(company, aspects), *tool_delays)
+        return results
     
     def _simulate_analysis(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                           product_info: List[Dict], financial_info: List[Dict]) -> None:
@@ -269,7 +220,8 @@ class SquidAIRunner(AgentRunner):
         
         self._update_token_usage(480)
         
-        time.sleep(1.0)
+        if self.simulate_latency:
+            time.sleep(1.0)
     
     def _generate_report(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                         product_info: List[Dict], financial_info: List[Dict]) -> str:
@@ -321,7 +273,8 @@ Based on our tool-based research using SquidAI, {company} demonstrates strong ma
         
         self._update_token_usage(400)
         
-        time.sleep(0.8)
+        if self.simulate_latency:
+            time.sleep(0.8)
         
         return report
 
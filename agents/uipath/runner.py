@@ -9,7 +9,6 @@ import os
 import time
 import json
 import logging
-import requests
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -21,20 +20,35 @@ except ImportError:
     UIPATH_AVAILABLE = False
     logging.warning("UiPath SDK not available. Using fallback implementation.")
 
-from agents.base_agent_runner import AgentRunner
+from agents.base_agent_runner import AsyncRAGAgentRunner
+from agents.common.rag_cache import RAGCache
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-class UiPathRunner(AgentRunner):
+RAG_ASPECTS = ("company information", "recent news", "financial data", "competitors analysis")
+
+# Placeholder (text template, score, relevance) per aspect when the RAG service has no results
+_PLACEHOLDERS = {
+    "company information": ("{company} is a prominent organization in its sector, known for its innovative approach and strong market presence.", 0.94, "high"),
+    "recent news": ("{company} has recently announced a series of strategic initiatives aimed at expanding its digital capabilities and market reach.", 0.91, "high"),
+    "financial data": ("{company}'s financial performance shows robust growth with a 15% increase in revenue and improved profit margins in the most recent fiscal year.", 0.93, "high"),
+    "competitors analysis": ("{company} maintains a competitive edge through its technological innovation, though faces increasing competition from emerging players in the market.", 0.89, "high")
+}
+_DEFAULT_PLACEHOLDER = ("Information about {company} related to {aspect}.", 0.76, "medium")
+
+class UiPathRunner(AsyncRAGAgentRunner):
     """
     Implementation of the AgentRunner for UiPath.
     
     This agent is tasked with researching a given company using the UiPath framework,
     which specializes in process automation and workflow orchestration for structured
-    data collection and analysis.
+    data collection and analysis. RAG queries for all aspects run concurrently; results
+    are cached per (company, aspect) across runner instances, and setting RAG_CACHE_PATH
+    also persists them in a SQLite file. The simulated planning, workflow and reporting
+    delays can be disabled by setting AGENT_SIMULATE_LATENCY to 0.
     
     Attributes:
         agent_name (str): Name of the agent framework ("uipath")
@@ -42,6 +56,11 @@ class UiPathRunner(AgentRunner):
         uipath_client: UiPath SDK client for interacting with UiPath Cloud Platform
     """
     
+    _rag_cache = RAGCache(os.getenv("RAG_CACHE_PATH") or None, namespace="uipath")
+    _placeholders = _PLACEHOLDERS
+    _default_placeholder = _DEFAULT_PLACEHOLDER
+    _rag_query_tokens = 110
+    
     def __init__(self, rag_service_url: str):
         """
         Initialize the UiPath runner.
@@ -81,28 +100,26 @@ class UiPathRunner(AgentRunner):
         else:
             self._simulate_workflow_planning(topic)
         
-        company_info = self._query_rag_service(topic, "company information")
+        company_info, news_info, financial_info, competitor_info = self._run_rag_queries(topic, RAG_ASPECTS)
+        
         self._add_step("rag_query", {
             "query": f"Company information for {topic}",
             "results": company_info,
             "usage": "Used to gather general company information"
         })
         
-        news_info = self._query_rag_service(topic, "recent news")
         self._add_step("rag_query", {
             "query": f"Recent news about {topic}",
             "results": news_info,
             "usage": "Used to gather recent news about the company"
         })
         
-        financial_info = self._query_rag_service(topic, "financial data")
         self._add_step("rag_query", {
             "query": f"Financial data for {topic}",
             "results": financial_info,
             "usage": "Used to analyze financial health and trends"
         })
         
-        competitor_info = self._query_rag_service(topic, "competitors analysis")
         self._add_step("rag_query", {
             "query": f"Competitors of {topic}",
             "results": competitor_info,
@@ -198,98 +215,8 @@ class UiPathRunner(AgentRunner):
         
         self._update_token_usage(220)
         
-        time.sleep(0.5)
-    
-    def _query_rag_service(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Query the RAG service for company information.
-        
-        This method retrieves relevant information from the RAG service
-        based on the company name and specific aspect to research.
-        
-        Args:
-            company: Company name to research
-            aspect: Specific aspect to research (e.g., "company information")
-            
-        Returns:
-            List of relevant documents
-        """
-        try:
-            query = f"{company} {aspect}"
-            
-            response = requests.get(
-                f"{self.rag_service_url}/query",
-                params={"q": query, "top_k": 3}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                results = []
-                for result in data.get("results", []):
-                    results.append({
-                        "text": result.get("chunk", ""),
-                        "metadata": result.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    })
-                
-                if not results:
-                    results = self._generate_placeholder_results(company, aspect)
-                
-                self._update_token_usage(110)
-                
-                return results
-            else:
-                logger.warning(f"RAG service returned status code {response.status_code}")
-                return self._generate_placeholder_results(company, aspect)
-                
-        except Exception as e:
-            logger.error(f"Error querying RAG service: {str(e)}")
-            return self._generate_placeholder_results(company, aspect)
-    
-    def _generate_placeholder_results(self, company: str, aspect: str) -> List[Dict[str, Any]]:
-        """
-        Generate placeholder results when RAG service is unavailable.
-        
-        This method creates simulated results for testing and fallback purposes.
-        
-        Args:
-            company: Company name
-            aspect: Research aspect
-            
-        Returns:
-            List of placeholder results
-        """
-        if aspect == "company information":
-            return [{
-                "text": f"{company} is a prominent organization in its sector, known for its innovative approach and strong market presence.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.94
-            }]
-        elif aspect == "recent news":
-            return [{
-                "text": f"{company} has recently announced a series of strategic initiatives aimed at expanding its digital capabilities and market reach.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.91
-            }]
-        elif aspect == "financial data":
-            return [{
-                "text": f"{company}'s financial performance shows robust growth with a 15% increase in revenue and improved profit margins in the most recent fiscal year.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.93
-            }]
-        elif aspect == "competitors analysis":
-            return [{
-                "text": f"{company} maintains a competitive edge through its technological innovation, though faces increasing competition from emerging players in the market.",
-                "metadata": {"source": "simulated", "relevance": "high"},
-                "score": 0.89
-            }]
-        else:
-            return [{
-                "text": f"Information about {company} related to {aspect}.",
-                "metadata": {"source": "simulated", "relevance": "medium"},
-                "score": 0.76
-            }]
+        if self.simulate_latency:
+            time.sleep(0.5)
     
     def _execute_automation_workflow(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                                    financial_info: List[Dict], competitor_info: List[Dict]) -> None:
@@ -412,7 +339,8 @@ class UiPathRunner(AgentRunner):
         
         self._update_token_usage(520)
         
-        time.sleep(1.1)
+        if self.simulate_latency:
+            time.sleep(1.1)
     
     def _generate_report(self, company: str, company_info: List[Dict], news_info: List[Dict], 
                         financial_info: List[Dict], competitor_info: List[Dict]) -> str:
@@ -468,7 +396,8 @@ The automated comparative analysis places {company} in the top quartile of indus
         
         self._update_token_usage(380)
         
-        time.sleep(0.8)
+        if self.simulate_latency:
+            time.sleep(0.8)
         
         return report
 
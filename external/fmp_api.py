@@ -6,6 +6,7 @@ It handles API requests, error handling, and data normalization.
 """
 
 import logging
+import logging.handlers
 import time
 import requests
 from typing import Dict, Any, Optional, List, Union
@@ -15,7 +16,9 @@ from utils.config import FMP_API_KEY, LOGS_DIR
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-failed_requests_handler = logging.FileHandler(LOGS_DIR / 'fmp_api_errors.log')
+failed_requests_handler = logging.handlers.TimedRotatingFileHandler(
+    LOGS_DIR / 'fmp_api_errors.log', when='midnight', backupCount=7, encoding='utf-8', delay=True
+)
 failed_requests_handler.setLevel(logging.ERROR)
 failed_requests_logger = logging.getLogger('fmp_api_errors')
 failed_requests_logger.addHandler(failed_requests_handler)
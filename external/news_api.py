@@ -6,6 +6,7 @@ It handles API requests, error handling, and data normalization.
 """
 
 import logging
+import logging.handlers
 import time
 import requests
 from typing import List, Dict, Any, Optional
@@ -16,7 +17,9 @@ from utils.config import NEWS_API_KEY, NEWS_API_MAX_ARTICLES, NEWS_API_SORT_BY,
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-failed_requests_handler = logging.FileHandler(LOGS_DIR / 'news_api_errors.log')
+failed_requests_handler = logging.handlers.TimedRotatingFileHandler(
+    LOGS_DIR / 'news_api_errors.log', when='midnight', backupCount=7, encoding='utf-8', delay=True
+)
 failed_requests_handler.setLevel(logging.ERROR)
 failed_requests_logger = logging.getLogger('news_api_errors')
 failed_requests_logger.addHandler(failed_requests_handler)
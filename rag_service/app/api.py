@@ -2,17 +2,19 @@ import os
 import time
 import json
 import requests
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 from pydantic import BaseModel, Field, HttpUrl
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from bs4 import BeautifulSoup
 import uvicorn
 
-app = FastAPI(title="RAG Service API")
+app = FastAPI(title="RAG Service API", default_response_class=ORJSONResponse)
 
 model = SentenceTransformer('all-MiniLM-L6-v2')
 
@@ -23,6 +25,14 @@ chunks = []
 metadata = []
 last_ingest_time = None
 
+# Handlers below run in FastAPI's threadpool; keep the index and the
+# chunk/metadata lists in step across concurrent ingests and queries.
+store_lock = threading.Lock()
+
+# Upper bounds on a single request's work
+MAX_TOP_K = 100
+MAX_BATCH_QUERIES = 64
+
 class IngestTextRequest(BaseModel):
     text: str
     metadata: Optional[Dict] = Field(default_factory=dict)
@@ -31,6 +41,13 @@ class IngestUrlRequest(BaseModel):
     url: HttpUrl
     metadata: Optional[Dict] = Field(default_factory=dict)
 
+class BatchQuery(BaseModel):
+    q: str
+    top_k: int = Field(5, ge=1, le=MAX_TOP_K)
+
+class QueryBatchRequest(BaseModel):
+    queries: List[BatchQuery] = Field(..., max_length=MAX_BATCH_QUERIES)
+
 class QueryResponse(BaseModel):
     query: str
     results: List[Dict]
@@ -83,7 +100,7 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[st
     return chunks
 
 @app.post("/ingest")
-async def ingest(request: Union[IngestTextRequest, IngestUrlRequest]):
+def ingest(request: Union[IngestTextRequest, IngestUrlRequest]):
     """
     Ingest text or URL content into the vector store.
     """
@@ -101,26 +118,32 @@ async def ingest(request: Union[IngestTextRequest, IngestUrlRequest]):
     
     text_chunks = chunk_text(text)
     
+    embeddings = []
     for chunk in text_chunks:
         embedding = model.encode([chunk])[0]
         
         faiss.normalize_L2(np.array([embedding], dtype=np.float32))
-        index.add(np.array([embedding], dtype=np.float32))
-        
-        chunks.append(chunk)
-        metadata.append(request_metadata)
+        embeddings.append(embedding)
     
-    last_ingest_time = datetime.now().isoformat()
+    with store_lock:
+        for chunk, embedding in zip(text_chunks, embeddings):
+            index.add(np.array([embedding], dtype=np.float32))
+            
+            chunks.append(chunk)
+            metadata.append(request_metadata)
+        
+        last_ingest_time = datetime.now().isoformat()
+        vector_store_size = len(chunks)
     
     return {
         "status": "success",
         "chunks_ingested": len(text_chunks),
-        "vector_store_size": len(chunks)
+        "vector_store_size": vector_store_size
     }
 
 @app.get("/query", response_model=QueryResponse)
-async def query(q: str = Query(..., description="Query string"), 
-                top_k: int = Query(5, description="Number of results to return")):
+def query(q: str = Query(..., description="Query string"), 
+          top_k: int = Query(5, ge=1, le=MAX_TOP_K, description="Number of results to return")):
     """
     Query the vector store for relevant chunks.
     """
@@ -132,26 +155,71 @@ async def query(q: str = Query(..., description="Query string"),
     query_embedding = model.encode([q])[0]
     faiss.normalize_L2(np.array([query_embedding], dtype=np.float32))
     
-    top_k = min(top_k, len(chunks))  # Ensure we don't request more than available
-    distances, indices = index.search(np.array([query_embedding], dtype=np.float32), top_k)
-    
-    results = []
-    for i, idx in enumerate(indices[0]):
-        if idx != -1:  # FAISS returns -1 for padded results
-            results.append({
-                "chunk": chunks[idx],
-                "metadata": metadata[idx],
-                "score": float(1.0 / (1.0 + distances[0][i]))  # Convert distance to similarity score
-            })
+    with store_lock:
+        top_k = min(top_k, len(chunks))  # Ensure we don't request more than available
+        distances, indices = index.search(np.array([query_embedding], dtype=np.float32), top_k)
+        
+        results = []
+        for i, idx in enumerate(indices[0]):
+            if idx != -1:  # FAISS returns -1 for padded results
+                results.append({
+                    "chunk": chunks[idx],
+                    "metadata": metadata[idx],
+                    "score": float(1.0 / (1.0 + distances[0][i]))  # Convert distance to similarity score
+                })
+        
+        total_chunks = len(chunks)
     
     time_taken = time.time() - start_time
     
-    return {
+    # Returning the response directly skips re-validating every result against
+    # QueryResponse; the model is still used for the OpenAPI schema.
+    return ORJSONResponse({
         "query": q,
         "results": results,
-        "total_chunks": len(chunks),
+        "total_chunks": total_chunks,
         "time_taken": time_taken
-    }
+    })
+
+@app.post("/query_batch")
+def query_batch(request: QueryBatchRequest):
+    """
+    Query the vector store for several queries in one round trip.
+    """
+    start_time = time.time()
+    
+    if not chunks:
+        raise HTTPException(status_code=400, detail="Vector store is empty. Ingest some data first.")
+    
+    if not request.queries:
+        return ORJSONResponse({"responses": [], "total_chunks": len(chunks), "time_taken": 0.0})
+    
+    # One encode call and one index search cover every query in the batch
+    query_embeddings = np.asarray(model.encode([item.q for item in request.queries]), dtype=np.float32)
+    faiss.normalize_L2(query_embeddings)
+    
+    with store_lock:
+        total_chunks = len(chunks)
+        max_k = min(max(item.top_k for item in request.queries), total_chunks)
+        distances, indices = index.search(query_embeddings, max_k)
+        
+        responses = []
+        for row, item in enumerate(request.queries):
+            results = []
+            for i, idx in enumerate(indices[row][:min(item.top_k, total_chunks)]):
+                if idx != -1:  # FAISS returns -1 for padded results
+                    results.append({
+                        "chunk": chunks[idx],
+                        "metadata": metadata[idx],
+                        "score": float(1.0 / (1.0 + distances[row][i]))
+                    })
+            responses.append({"query": item.q, "results": results})
+    
+    return ORJSONResponse({
+        "responses": responses,
+        "total_chunks": total_chunks,
+        "time_taken": time.time() - start_time
+    })
 
 @app.get("/status", response_model=StatusResponse)
 async def status():
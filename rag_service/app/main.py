@@ -1,17 +1,35 @@
+import os
+from typing import List
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, RedirectResponse
+
+app = FastAPI(title="RAG Service API", default_response_class=ORJSONResponse)
 
-app = FastAPI(title="RAG Service API")
+def _parse_origins(value: str) -> List[str]:
+    """Parse a comma-separated origin list, keeping a bare wildcard as ["*"]."""
+    if value.strip() == "*":
+        return ["*"]
+    return [origin.strip() for origin in value.split(",") if origin.strip()]
+
+cors_origins = _parse_origins(os.getenv("CORS_ORIGINS", "*"))
+# Credentials cannot be used with a wildcard origin, so only enable them for explicit origins
+cors_allow_credentials = "*" not in cors_origins and \
+    os.getenv("CORS_ALLOW_CREDENTIALS", "true").lower() in ("true", "yes", "1", "y")
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allows all origins
-    allow_credentials=True,
+    allow_origins=cors_origins,  # Allows all origins unless CORS_ORIGINS is set
+    allow_credentials=cors_allow_credentials,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
 )
 
+# Query responses carry full chunk text; level 1 keeps compression cheap
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
 from .api import app as api_app
 
 for route in api_app.routes:
@@ -15,9 +15,9 @@ class TestAutoGenRunner:
     """Test cases for the AutoGen runner."""
     
     @pytest.fixture
-    def mock_requests(self):
-        """Mock requests module for testing."""
-        with patch('agents.autogen.runner.requests') as mock_requests:
+    def mock_session(self, autogen_runner):
+        """Mock the runner's pooled HTTP session for testing."""
+        with patch.object(autogen_runner, 'session') as mock_session:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
@@ -29,8 +29,8 @@ class TestAutoGenRunner:
                     }
                 ]
             }
-            mock_requests.get.return_value = mock_response
-            yield mock_requests
+            mock_session.get.return_value = mock_response
+            yield mock_session
     
     @pytest.fixture
     def autogen_runner(self):
@@ -42,7 +42,7 @@ class TestAutoGenRunner:
         assert autogen_runner.agent_name == "autogen"
         assert autogen_runner.rag_service_url == "http://localhost:8000"
     
-    def test_run_task(self, autogen_runner, mock_requests):
+    def test_run_task(self, autogen_runner, mock_session):
         """Test run_task method."""
         with patch('time.sleep'):  # Mock sleep to speed up tests
             result = autogen_runner.run_task("Test Company")
@@ -53,7 +53,18 @@ class TestAutoGenRunner:
             assert result["token_usage"] > 0
             assert isinstance(result["response_time"], float)
     
-    def test_query_rag_service_success(self, autogen_runner, mock_requests):
+    def test_run_task_error_step_order(self, autogen_runner, mock_session):
+        """Test each aspect's error step is recorded right before its rag_query step."""
+        mock_session.get.side_effect = Exception("Test error")
+        
+        with patch('time.sleep'):
+            result = autogen_runner.run_task("Test Company")
+        
+        step_types = [step["step_type"] for step in result["steps"]]
+        first = step_types.index("error")
+        assert step_types[first:first + 8] == ["error", "rag_query"] * 4
+    
+    def test_query_rag_service_success(self, autogen_runner, mock_session):
         """Test _query_rag_service method with successful response."""
         results = autogen_runner._query_rag_service("Test Company", "company information")
         
@@ -62,14 +73,15 @@ class TestAutoGenRunner:
         assert results[0]["metadata"] == {"source": "test"}
         assert results[0]["score"] == 0.95
         
-        mock_requests.get.assert_called_once_with(
+        mock_session.get.assert_called_once_with(
             "http://localhost:8000/query",
-            params={"q": "Test Company company information", "top_k": 3}
+            params={"q": "Test Company company information", "top_k": 3},
+            timeout=(1.0, 5.0)
         )
     
     def test_query_rag_service_error(self, autogen_runner):
         """Test _query_rag_service method with error response."""
-        with patch('agents.autogen.runner.requests.get') as mock_get:
+        with patch.object(autogen_runner.session, 'get') as mock_get:
             mock_get.side_effect = Exception("Test error")
             
             results = autogen_runner._query_rag_service("Test Company", "company information")
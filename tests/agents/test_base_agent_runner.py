@@ -6,11 +6,12 @@ import os
 import json
 import time
 import pytest
+import threading
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 from pathlib import Path
 
-from agents.base_agent_runner import AgentRunner
+from agents.base_agent_runner import AgentRunner, coalesce_runs
 
 class TestAgentRunner(AgentRunner):
     """Test implementation of the AgentRunner abstract class."""
@@ -32,6 +33,13 @@ class TestAgentRunner(AgentRunner):
         return self.format_output()
 
 
+class BatchTestAgentRunner(TestAgentRunner):
+    """Test runner constructed from the RAG service URL alone, like the framework runners."""
+    
+    def __init__(self, rag_service_url: str):
+        super().__init__("test_agent", rag_service_url)
+
+
 class TestBaseAgentRunner:
     """Test cases for the base agent runner."""
     
@@ -50,6 +58,13 @@ class TestBaseAgentRunner:
         assert agent_runner.token_usage == 0
         assert agent_runner.final_output == ""
     
+    def test_simulate_latency(self, tmp_path):
+        """Test simulated latency follows the environment default unless overridden."""
+        with patch.object(Path, 'mkdir'):
+            with patch('agents.base_agent_runner.SIMULATE_LATENCY', False):
+                assert not TestAgentRunner("test_agent", "http://localhost:8000").simulate_latency
+                assert TestAgentRunner("test_agent", "http://localhost:8000", simulate_latency=True).simulate_latency
+    
     def test_run_task(self, agent_runner):
         """Test run_task method."""
         result = agent_runner.run_task("test_topic")
@@ -67,8 +82,36 @@ class TestBaseAgentRunner:
         assert len(agent_runner.steps) == 1
         assert agent_runner.steps[0]["step_type"] == "test_type"
         assert agent_runner.steps[0]["key"] == "value"
-        assert "timestamp" in agent_runner.steps[0]
+        assert "ts_us" in agent_runner.steps[0]
         assert "step_id" in agent_runner.steps[0]
+        
+        output = agent_runner.format_output()
+        assert datetime.fromisoformat(output["steps"][0]["timestamp"])
+    
+    def test_add_steps_bulk(self, agent_runner):
+        """Test _add_steps_bulk method."""
+        agent_runner._add_step("first", {})
+        agent_runner._add_steps_bulk([("second", {"key": "a"}), ("third", {"key": "b"})])
+        
+        assert [step["step_id"] for step in agent_runner.steps] == [1, 2, 3]
+        assert agent_runner.steps[2]["step_type"] == "third"
+        assert agent_runner.steps[2]["key"] == "b"
+    
+    def test_stream_steps(self, agent_runner, tmp_path):
+        """Test steps are appended to a JSONL log when streaming is enabled."""
+        agent_runner.logs_dir = tmp_path
+        
+        with patch('agents.base_agent_runner.STREAM_STEPS', True):
+            agent_runner.run_task("test_topic")
+        
+        step_logs = list(tmp_path.glob("steps_*.jsonl"))
+        assert len(step_logs) == 1
+        
+        lines = step_logs[0].read_text().splitlines()
+        assert len(lines) == 4
+        assert json.loads(lines[0])["step_type"] == "task_start"
+        assert json.loads(lines[-1])["step_type"] == "task_complete"
+        assert agent_runner._steps_fp is None
     
     def test_update_token_usage(self, agent_runner):
         """Test _update_token_usage method."""
@@ -114,8 +157,8 @@ class TestBaseAgentRunner:
         assert len(output["steps"]) == 1
     
     @patch('builtins.open', new_callable=MagicMock)
-    @patch('json.dump')
-    def test_log_metadata(self, mock_json_dump, mock_open, agent_runner):
+    @patch('orjson.dumps')
+    def test_log_metadata(self, mock_orjson_dumps, mock_open, agent_runner):
         """Test log_metadata method."""
         agent_runner.start_time = time.time() - 3
         agent_runner.end_time = time.time()
@@ -124,11 +167,12 @@ class TestBaseAgentRunner:
         agent_runner._add_step("test_log_step", {"log_data": "test"})
         
         log_path = agent_runner.log_metadata()
+        agent_runner._log_future.result()
         
         assert mock_open.called
-        assert mock_json_dump.called
+        assert mock_orjson_dumps.called
         
-        args, _ = mock_json_dump.call_args
+        args, _ = mock_orjson_dumps.call_args
         log_data = args[0]
         
         assert log_data["agent_name"] == "test_agent"
@@ -137,3 +181,75 @@ class TestBaseAgentRunner:
         assert len(log_data["steps"]) == 1
         assert log_data["steps"][0]["step_type"] == "test_log_step"
         assert log_data["steps"][0]["log_data"] == "test"
+    
+    @patch('builtins.open', new_callable=MagicMock)
+    @patch('orjson.dumps')
+    def test_log_metadata_final_output_once(self, mock_orjson_dumps, mock_open, agent_runner):
+        """Test the final report is not repeated in the logged steps."""
+        agent_runner._set_final_output("Long final report")
+        
+        agent_runner.log_metadata()
+        agent_runner._log_future.result()
+        
+        log_data = mock_orjson_dumps.call_args[0][0]
+        
+        assert log_data["final_output"] == "Long final report"
+        assert log_data["steps"][0]["output"] == "<final_output>"
+        assert agent_runner.steps[0]["output"] == "Long final report"
+    
+    def test_coalesce_runs(self):
+        """Test concurrent runs for the same topic share one execution."""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        @coalesce_runs
+        def run_task(runner, topic):
+            calls.append(topic)
+            started.set()
+            release.wait(5)
+            return {"topic": topic}
+        
+        runner = MagicMock(agent_name="test_agent")
+        results = []
+        
+        leader = threading.Thread(target=lambda: results.append(run_task(runner, "Apple Inc.")))
+        leader.start()
+        started.wait(5)
+        
+        follower = threading.Thread(target=lambda: results.append(run_task(runner, " apple inc. ")))
+        follower.start()
+        time.sleep(0.2)  # Let the follower block on the leader's run
+        release.set()
+        leader.join(5)
+        follower.join(5)
+        
+        assert calls == ["Apple Inc."]
+        assert results == [{"topic": "Apple Inc."}, {"topic": "Apple Inc."}]
+        
+        run_task(runner, "Apple Inc.")
+        assert len(calls) == 2
+
+    def test_run_batch(self, tmp_path):
+        """Test run_batch runs every topic in worker processes and keeps their order."""
+        with patch('agents.base_agent_runner.LOGS_DIR', tmp_path):
+            runner = BatchTestAgentRunner("http://localhost:8000")
+            
+            results = runner.run_batch(["Alpha", "Beta", "Gamma"], max_workers=2)
+        
+        assert [r["final_output"] for r in results] == [
+            "Test output for Alpha", "Test output for Beta", "Test output for Gamma"
+        ]
+        assert runner.run_batch([]) == []
+    
+    def test_run_batch_isolates_topics(self, tmp_path):
+        """Test a worker reusing its runner reports only each topic's own steps and tokens."""
+        with patch('agents.base_agent_runner.LOGS_DIR', tmp_path):
+            runner = BatchTestAgentRunner("http://localhost:8000")
+            
+            results = runner.run_batch(["Alpha", "Beta", "Gamma"], max_workers=1)
+        
+        for topic, result in zip(["Alpha", "Beta", "Gamma"], results):
+            assert len(result["steps"]) == 4
+            assert result["steps"][0]["topic"] == topic
+            assert result["token_usage"] == 100
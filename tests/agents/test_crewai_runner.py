@@ -6,21 +6,33 @@ import os
 import json
 import time
 import pytest
-from unittest.mock import patch, MagicMock
+import threading
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 
 from agents.crewai.runner import CrewAIRunner
+from agents.common.circuit_breaker import rag_breaker
+from agents.common.rag_cache import RAGCache, SemanticRAGCache
 
 class TestCrewAIRunner:
     """Test cases for the CrewAI runner."""
     
+    @pytest.fixture(autouse=True)
+    def clear_rag_cache(self):
+        """Start every test with an empty RAG result cache and a closed circuit breaker."""
+        CrewAIRunner.clear_cache()
+        rag_breaker.reset()
+        yield
+        CrewAIRunner.clear_cache()
+        rag_breaker.reset()
+    
     @pytest.fixture
-    def mock_requests(self):
-        """Mock requests module for testing."""
-        with patch('agents.crewai.runner.requests') as mock_requests:
+    def mock_client(self, crewai_runner):
+        """Mock the runner's async HTTP client for testing."""
+        with patch.object(crewai_runner, '_client') as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
+            mock_response.content = json.dumps({
                 "results": [
                     {
                         "chunk": "Test company information",
@@ -28,9 +40,27 @@ class TestCrewAIRunner:
                         "score": 0.95
                     }
                 ]
-            }
-            mock_requests.get.return_value = mock_response
-            yield mock_requests
+            }).encode()
+            mock_client.get = AsyncMock(return_value=mock_response)
+            
+            mock_batch_response = MagicMock()
+            mock_batch_response.status_code = 200
+            mock_batch_response.content = json.dumps({
+                "responses": [
+                    {
+                        "query": "Test Company company information",
+                        "results": [
+                            {
+                                "chunk": "Batched company information",
+                                "metadata": {"source": "test"},
+                                "score": 0.9
+                            }
+                        ]
+                    }
+                ]
+            }).encode()
+            mock_client.post = AsyncMock(return_value=mock_batch_response)
+            yield mock_client
     
     @pytest.fixture
     def crewai_runner(self):
@@ -42,7 +72,7 @@ class TestCrewAIRunner:
         assert crewai_runner.agent_name == "crewai"
         assert crewai_runner.rag_service_url == "http://localhost:8000"
     
-    def test_run_task(self, crewai_runner, mock_requests):
+    def test_run_task(self, crewai_runner, mock_client):
         """Test run_task method."""
         with patch('time.sleep'):  # Mock sleep to speed up tests
             result = crewai_runner.run_task("Test Company")
@@ -53,7 +83,55 @@ class TestCrewAIRunner:
             assert result["token_usage"] > 0
             assert isinstance(result["response_time"], float)
     
-    def test_query_rag_service_success(self, crewai_runner, mock_requests):
+    def test_run_rag_queries_batch(self, crewai_runner, mock_client):
+        """Test multiple aspects are fetched with a single batch request."""
+        results = crewai_runner._run_rag_queries("Test Company", ("company information", "latest news"))
+        
+        assert results[0][0]["text"] == "Batched company information"
+        assert results[1][0]["metadata"]["source"] == "simulated"
+        assert crewai_runner.token_usage == 100
+        assert not mock_client.get.called
+        mock_client.post.assert_called_once_with(
+            "http://localhost:8000/query_batch",
+            json={"queries": [
+                {"q": "Test Company company information", "top_k": 3},
+                {"q": "Test Company latest news", "top_k": 3}
+            ]}
+        )
+    
+    def test_run_rag_queries_batch_unsupported(self, crewai_runner, mock_client):
+        """Test single queries are used when the batch endpoint is missing."""
+        mock_client.post.return_value.status_code = 404
+        
+        results = crewai_runner._run_rag_queries("Test Company", ("company information", "latest news"))
+        
+        assert len(results) == 2
+        assert results[0][0]["text"] == "Test company information"
+        assert mock_client.get.call_count == 2
+        
+        crewai_runner._run_rag_queries("Other Company", ("company information", "latest news"))
+        
+        assert mock_client.post.call_count == 1
+    
+    def test_run_rag_queries_batch_failure(self, crewai_runner, mock_client):
+        """Test aspects the service did not answer are not charged tokens."""
+        mock_client.post.side_effect = Exception("Test error")
+        
+        results = crewai_runner._run_rag_queries("Test Company", ("company information", "latest news"))
+        
+        assert results[0][0]["metadata"]["source"] == "simulated"
+        assert crewai_runner.token_usage == 0
+    
+    def test_run_rag_queries_batch_malformed(self, crewai_runner, mock_client):
+        """Test a malformed batch response falls back to placeholder results."""
+        mock_client.post.return_value.content = b"<html>proxy error</html>"
+        
+        results = crewai_runner._run_rag_queries("Test Company", ("company information", "latest news"))
+        
+        assert all(r[0]["metadata"]["source"] == "simulated" for r in results)
+        assert crewai_runner.token_usage == 0
+    
+    def test_query_rag_service_success(self, crewai_runner, mock_client):
         """Test _query_rag_service method with successful response."""
         results = crewai_runner._query_rag_service("Test Company", "company information")
         
@@ -62,14 +140,90 @@ class TestCrewAIRunner:
         assert results[0]["metadata"] == {"source": "test"}
         assert results[0]["score"] == 0.95
         
-        mock_requests.get.assert_called_once_with(
+        mock_client.get.assert_called_once_with(
             "http://localhost:8000/query",
             params={"q": "Test Company company information", "top_k": 3}
         )
     
+    def test_query_rag_service_cached(self, crewai_runner, mock_client):
+        """Test repeated _query_rag_service calls are served from the cache."""
+        first = crewai_runner._query_rag_service("Test Company", "company information")
+        second = crewai_runner._query_rag_service(" test company ", "company information")
+        
+        assert second == first
+        assert mock_client.get.call_count == 1
+    
+    def test_rag_cache_namespaces(self, tmp_path):
+        """Test frameworks sharing a cache file do not see or clear each other's entries."""
+        db_path = tmp_path / "rag_cache.sqlite"
+        crewai_cache = RAGCache(db_path, namespace="crewai")
+        h2oai_cache = RAGCache(db_path, namespace="h2oai")
+        results = [{"text": "Cached", "metadata": {}, "score": 0.9}]
+        
+        assert not db_path.exists()
+        crewai_cache.set("Test Company", "company information", results)
+        h2oai_cache.set("Test Company", "company information", results)
+        
+        assert RAGCache(db_path, namespace="h2oai").get("Test Company", "company information") == results
+        
+        crewai_cache.clear()
+        assert RAGCache(db_path, namespace="crewai").get("Test Company", "company information") is None
+        assert RAGCache(db_path, namespace="h2oai").get("Test Company", "company information") == results
+    
+    def test_persistent_cache_runs_off_rag_loop(self, crewai_runner, mock_client, tmp_path):
+        """Test SQLite cache reads and writes do not block the shared RAG event loop."""
+        cache = RAGCache(tmp_path / "rag_cache.sqlite", namespace="crewai")
+        threads = []
+        
+        def record_thread(method):
+            def wrapper(*args):
+                threads.append(threading.current_thread().name)
+                return method(*args)
+            return wrapper
+        
+        with patch.object(cache, 'get', record_thread(cache.get)), patch.object(cache, 'set', record_thread(cache.set)):
+            with patch.object(CrewAIRunner, '_rag_cache', cache):
+                crewai_runner._run_rag_queries("Test Company", ("company information", "latest news"))
+        
+        assert threads
+        assert "rag-loop" not in threads
+
+    def test_query_rag_service_semantic_cache(self, crewai_runner, mock_client):
+        """Test near-duplicate queries are served from the semantic cache."""
+        cache = SemanticRAGCache()
+        embeddings = {
+            "Apple Inc. company information": [1.0, 0.0, 0.0],
+            "Apple Inc company information": [0.99, 0.05, 0.0],
+            "Apple Inc latest news": [0.0, 1.0, 0.0]
+        }
+        
+        with patch.object(cache, '_model') as mock_model:
+            mock_model.encode.side_effect = lambda query: embeddings[query]
+            with patch.object(CrewAIRunner, '_semantic_cache', cache):
+                first = crewai_runner._query_rag_service("Apple Inc.", "company information")
+                second = crewai_runner._query_rag_service("Apple Inc", "company information")
+                crewai_runner._query_rag_service("Apple Inc", "latest news")
+        
+        assert second == first
+        assert mock_client.get.call_count == 2
+    
+    def test_semantic_cache_expires(self):
+        """Test semantic cache entries older than the TTL are not returned."""
+        cache = SemanticRAGCache(ttl=60)
+        results = [{"text": "Cached", "metadata": {}, "score": 0.9}]
+        
+        with patch.object(cache, '_model') as mock_model:
+            mock_model.encode.return_value = [1.0, 0.0, 0.0]
+            with patch('agents.common.rag_cache.time.time', return_value=1000.0):
+                cache.set("Apple Inc. company information", results)
+                assert cache.get("Apple Inc company information") == (1000.0, results)
+            
+            with patch('agents.common.rag_cache.time.time', return_value=1060.0):
+                assert cache.get("Apple Inc company information") is None
+    
     def test_query_rag_service_error(self, crewai_runner):
         """Test _query_rag_service method with error response."""
-        with patch('agents.crewai.runner.requests.get') as mock_get:
+        with patch.object(crewai_runner._client, 'get', new_callable=AsyncMock) as mock_get:
             mock_get.side_effect = Exception("Test error")
             
             results = crewai_runner._query_rag_service("Test Company", "company information")
@@ -100,7 +254,7 @@ class TestCrewAIRunner:
     def test_simulate_analysis(self, crewai_runner):
         """Test _simulate_analysis method."""
         with patch('time.sleep'):
-            with patch.object(crewai_runner, '_add_step') as mock_add_step:
+            with patch.object(crewai_runner, '_add_steps_bulk') as mock_add_steps_bulk:
                 company_info = [{"text": "Test company info"}]
                 news_info = [{"text": "Test news"}]
                 product_info = [{"text": "Test products"}]
@@ -114,7 +268,11 @@ class TestCrewAIRunner:
                     financial_info
                 )
                 
-                assert mock_add_step.call_count == 4
+                mock_add_steps_bulk.assert_called_once()
+                steps = mock_add_steps_bulk.call_args[0][0]
+                assert len(steps) == 4
+                assert all(step_type == "analysis" for step_type, _ in steps)
+                assert "Test Company" in steps[0][1]["thought"]
     
     def test_generate_report(self, crewai_runner):
         """Test _generate_report method."""
@@ -6,21 +6,31 @@ import os
 import json
 import time
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 
 from agents.h2oai.runner import H2OAIRunner
+from agents.common.circuit_breaker import rag_breaker
 
 class TestH2OAIRunner:
     """Test cases for the H2O AI runner."""
     
+    @pytest.fixture(autouse=True)
+    def clear_rag_cache(self):
+        """Start every test with an empty RAG result cache and a closed circuit breaker."""
+        H2OAIRunner.clear_cache()
+        rag_breaker.reset()
+        yield
+        H2OAIRunner.clear_cache()
+        rag_breaker.reset()
+    
     @pytest.fixture
-    def mock_requests(self):
-        """Mock requests module for testing."""
-        with patch('agents.h2oai.runner.requests') as mock_requests:
+    def mock_client(self, h2oai_runner):
+        """Mock the runner's async HTTP client for testing."""
+        with patch.object(h2oai_runner, '_client') as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
+            mock_response.content = json.dumps({
                 "results": [
                     {
                         "chunk": "Test company information",
@@ -28,9 +38,20 @@ class TestH2OAIRunner:
                         "score": 0.95
                     }
                 ]
-            }
-            mock_requests.get.return_value = mock_response
-            yield mock_requests
+            }).encode()
+            mock_client.get = AsyncMock(return_value=mock_response)
+            
+            mock_batch_response = MagicMock()
+            mock_batch_response.status_code = 200
+            mock_batch_response.content = json.dumps({
+                "responses": [
+                    {"query": "Test Company company overview", "results": [
+                        {"chunk": "Batched company overview", "metadata": {"source": "test"}, "score": 0.9}
+                    ]}
+                ]
+            }).encode()
+            mock_client.post = AsyncMock(return_value=mock_batch_response)
+            yield mock_client
     
     @pytest.fixture
     def h2oai_runner(self):
@@ -42,7 +63,7 @@ class TestH2OAIRunner:
         assert h2oai_runner.agent_name == "h2oai"
         assert h2oai_runner.rag_service_url == "http://localhost:8000"
     
-    def test_run_task(self, h2oai_runner, mock_requests):
+    def test_run_task(self, h2oai_runner, mock_client):
         """Test run_task method."""
         with patch('time.sleep'):  # Mock sleep to speed up tests
             result = h2oai_runner.run_task("Test Company")
@@ -53,7 +74,48 @@ class TestH2OAIRunner:
             assert result["token_usage"] > 0
             assert isinstance(result["response_time"], float)
     
-    def test_query_rag_service_success(self, h2oai_runner, mock_requests):
+    def test_run_rag_queries_batch(self, h2oai_runner, mock_client):
+        """Test all aspects are fetched with a single batch request."""
+        results = h2oai_runner._run_rag_queries("Test Company", ("company overview", "market forecast"))
+        
+        assert results[0][0]["text"] == "Batched company overview"
+        assert results[1][0]["metadata"]["source"] == "simulated"
+        assert h2oai_runner.token_usage == 100
+        assert mock_client.post.call_count == 1
+        assert not mock_client.get.called
+    
+    def test_run_rag_queries_batch_unsupported(self, h2oai_runner, mock_client):
+        """Test single queries are used when the batch endpoint is missing."""
+        mock_client.post.return_value.status_code = 404
+        
+        results = h2oai_runner._run_rag_queries("Test Company", ("company overview", "market forecast"))
+        
+        assert results[0][0]["text"] == "Test company information"
+        assert mock_client.get.call_count == 2
+        
+        h2oai_runner._run_rag_queries("Other Company", ("company overview", "market forecast"))
+        
+        assert mock_client.post.call_count == 1
+    
+    def test_run_rag_queries_batch_failure(self, h2oai_runner, mock_client):
+        """Test aspects the service did not answer are not charged tokens."""
+        mock_client.post.side_effect = Exception("Test error")
+        
+        results = h2oai_runner._run_rag_queries("Test Company", ("company overview", "market forecast"))
+        
+        assert results[0][0]["metadata"]["source"] == "simulated"
+        assert h2oai_runner.token_usage == 0
+    
+    def test_run_rag_queries_batch_malformed(self, h2oai_runner, mock_client):
+        """Test a malformed batch response falls back to placeholder results."""
+        mock_client.post.return_value.content = b"<html>proxy error</html>"
+        
+        results = h2oai_runner._run_rag_queries("Test Company", ("company overview", "market forecast"))
+        
+        assert all(r[0]["metadata"]["source"] == "simulated" for r in results)
+        assert h2oai_runner.token_usage == 0
+    
+    def test_query_rag_service_success(self, h2oai_runner, mock_client):
         """Test _query_rag_service method with successful response."""
         results = h2oai_runner._query_rag_service("Test Company", "company overview")
         
@@ -62,14 +124,22 @@ class TestH2OAIRunner:
         assert results[0]["metadata"] == {"source": "test"}
         assert results[0]["score"] == 0.95
         
-        mock_requests.get.assert_called_once_with(
+        mock_client.get.assert_called_once_with(
             "http://localhost:8000/query",
             params={"q": "Test Company company overview", "top_k": 3}
         )
     
+    def test_query_rag_service_cached(self, h2oai_runner, mock_client):
+        """Test repeated _query_rag_service calls are served from the cache."""
+        first = h2oai_runner._query_rag_service("Test Company", "company overview")
+        second = h2oai_runner._query_rag_service(" test company ", "company overview")
+        
+        assert second == first
+        assert mock_client.get.call_count == 1
+    
     def test_query_rag_service_error(self, h2oai_runner):
         """Test _query_rag_service method with error response."""
-        with patch('agents.h2oai.runner.requests.get') as mock_get:
+        with patch.object(h2oai_runner._client, 'get', new_callable=AsyncMock) as mock_get:
             mock_get.side_effect = Exception("Test error")
             
             results = h2oai_runner._query_rag_service("Test Company", "company overview")
@@ -10,17 +10,27 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime
 
 from agents.langgraph.runner import LangGraphRunner
+from agents.common.circuit_breaker import rag_breaker
 
 class TestLangGraphRunner:
     """Test cases for the LangGraph runner."""
     
+    @pytest.fixture(autouse=True)
+    def clear_rag_cache(self):
+        """Start every test with an empty RAG result cache and a closed circuit breaker."""
+        LangGraphRunner.clear_cache()
+        rag_breaker.reset()
+        yield
+        LangGraphRunner.clear_cache()
+        rag_breaker.reset()
+    
     @pytest.fixture
-    def mock_requests(self):
-        """Mock requests module for testing."""
-        with patch('agents.langgraph.runner.requests') as mock_requests:
+    def mock_session(self, langgraph_runner):
+        """Mock the runner's pooled HTTP session for testing."""
+        with patch.object(langgraph_runner, 'session') as mock_session:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
+            mock_response.content = json.dumps({
                 "results": [
                     {
                         "chunk": "Test company information",
@@ -28,9 +38,20 @@ class TestLangGraphRunner:
                         "score": 0.95
                     }
                 ]
-            }
-            mock_requests.get.return_value = mock_response
-            yield mock_requests
+            }).encode()
+            mock_session.get.return_value = mock_response
+            
+            mock_batch_response = MagicMock()
+            mock_batch_response.status_code = 200
+            mock_batch_response.content = json.dumps({
+                "responses": [
+                    {"query": "Test Company company profile", "results": [
+                        {"chunk": "Batched company profile", "metadata": {"source": "test"}, "score": 0.9}
+                    ]}
+                ]
+            }).encode()
+            mock_session.post.return_value = mock_batch_response
+            yield mock_session
     
     @pytest.fixture
     def langgraph_runner(self):
@@ -42,7 +63,7 @@ class TestLangGraphRunner:
         assert langgraph_runner.agent_name == "langgraph"
         assert langgraph_runner.rag_service_url == "http://localhost:8000"
     
-    def test_run_task(self, langgraph_runner, mock_requests):
+    def test_run_task(self, langgraph_runner, mock_session):
         """Test run_task method."""
         with patch('time.sleep'):  # Mock sleep to speed up tests
             result = langgraph_runner.run_task("Test Company")
@@ -53,7 +74,7 @@ class TestLangGraphRunner:
             assert result["token_usage"] > 0
             assert isinstance(result["response_time"], float)
     
-    def test_query_rag_service_success(self, langgraph_runner, mock_requests):
+    def test_query_rag_service_success(self, langgraph_runner, mock_session):
         """Test _query_rag_service method with successful response."""
         results = langgraph_runner._query_rag_service("Test Company", "company information")
         
@@ -62,14 +83,71 @@ class TestLangGraphRunner:
         assert results[0]["metadata"] == {"source": "test"}
         assert results[0]["score"] == 0.95
         
-        mock_requests.get.assert_called_once_with(
+        mock_session.get.assert_called_once_with(
             "http://localhost:8000/query",
-            params={"q": "Test Company company information", "top_k": 3}
+            params={"q": "Test Company company information", "top_k": 3},
+            timeout=(1.0, 5.0)
+        )
+    
+    def test_query_rag_service_batch(self, langgraph_runner, mock_session):
+        """Test _query_rag_service_batch sends one request for several aspects."""
+        results = langgraph_runner._query_rag_service_batch("Test Company", ("company profile", "latest news"))
+        
+        assert results["company profile"][0]["text"] == "Batched company profile"
+        assert results["latest news"][0]["metadata"]["source"] == "simulated"
+        assert langgraph_runner.token_usage == 100
+        mock_session.post.assert_called_once_with(
+            "http://localhost:8000/query_batch",
+            json={"queries": [
+                {"q": "Test Company company profile", "top_k": 3},
+                {"q": "Test Company latest news", "top_k": 3}
+            ]},
+            timeout=(1.0, 5.0)
         )
+        assert not mock_session.get.called
+    
+    def test_query_rag_service_batch_unsupported(self, langgraph_runner, mock_session):
+        """Test single queries are used when the batch endpoint is missing."""
+        mock_session.post.return_value.status_code = 404
+        
+        results = langgraph_runner._query_rag_service_batch("Test Company", ("company profile", "latest news"))
+        
+        assert results["latest news"][0]["text"] == "Test company information"
+        assert mock_session.get.call_count == 2
+        
+        langgraph_runner._query_rag_service_batch("Other Company", ("company profile", "latest news"))
+        
+        assert mock_session.post.call_count == 1
+    
+    def test_query_rag_service_batch_failure(self, langgraph_runner, mock_session):
+        """Test aspects the service did not answer are not charged tokens."""
+        mock_session.post.side_effect = Exception("Test error")
+        
+        results = langgraph_runner._query_rag_service_batch("Test Company", ("company profile", "latest news"))
+        
+        assert results["company profile"][0]["metadata"]["source"] == "simulated"
+        assert langgraph_runner.token_usage == 0
+    
+    def test_query_rag_service_batch_malformed(self, langgraph_runner, mock_session):
+        """Test a malformed batch response falls back to placeholder results."""
+        mock_session.post.return_value.content = b"<html>proxy error</html>"
+        
+        results = langgraph_runner._query_rag_service_batch("Test Company", ("company profile", "latest news"))
+        
+        assert all(r[0]["metadata"]["source"] == "simulated" for r in results.values())
+        assert langgraph_runner.token_usage == 0
+    
+    def test_query_rag_service_cached(self, langgraph_runner, mock_session):
+        """Test repeated _query_rag_service calls are served from the cache."""
+        first = langgraph_runner._query_rag_service("Test Company", "company information")
+        second = langgraph_runner._query_rag_service(" test company ", "company information")
+        
+        assert second == first
+        assert mock_session.get.call_count == 1
     
     def test_query_rag_service_error(self, langgraph_runner):
         """Test _query_rag_service method with error response."""
-        with patch('agents.langgraph.runner.requests.get') as mock_get:
+        with patch.object(langgraph_runner.session, 'get') as mock_get:
             mock_get.side_effect = Exception("Test error")
             
             results = langgraph_runner._query_rag_service("Test Company", "company information")
@@ -6,21 +6,31 @@ import os
 import json
 import time
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 
 from agents.lettaai.runner import LettaAIRunner
+from agents.common.circuit_breaker import rag_breaker
 
 class TestLettaAIRunner:
     """Test cases for the LettaAI runner."""
     
+    @pytest.fixture(autouse=True)
+    def clear_rag_cache(self):
+        """Start every test with an empty RAG result cache and a closed circuit breaker."""
+        LettaAIRunner.clear_cache()
+        rag_breaker.reset()
+        yield
+        LettaAIRunner.clear_cache()
+        rag_breaker.reset()
+    
     @pytest.fixture
-    def mock_requests(self):
-        """Mock requests module for testing."""
-        with patch('agents.lettaai.runner.requests') as mock_requests:
+    def mock_client(self, lettaai_runner):
+        """Mock the runner's async HTTP client for testing."""
+        with patch.object(lettaai_runner, '_client') as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
+            mock_response.content = json.dumps({
                 "results": [
                     {
                         "chunk": "Test company information",
@@ -28,9 +38,20 @@ class TestLettaAIRunner:
                         "score": 0.95
                     }
                 ]
-            }
-            mock_requests.get.return_value = mock_response
-            yield mock_requests
+            }).encode()
+            mock_client.get = AsyncMock(return_value=mock_response)
+            
+            mock_batch_response = MagicMock()
+            mock_batch_response.status_code = 200
+            mock_batch_response.content = json.dumps({
+                "responses": [
+                    {"query": "Test Company company profile", "results": [
+                        {"chunk": "Batched company profile", "metadata": {"source": "test"}, "score": 0.9}
+                    ]}
+                ]
+            }).encode()
+            mock_client.post = AsyncMock(return_value=mock_batch_response)
+            yield mock_client
     
     @pytest.fixture
     def lettaai_runner(self):
@@ -42,7 +63,7 @@ class TestLettaAIRunner:
         assert lettaai_runner.agent_name == "lettaai"
         assert lettaai_runner.rag_service_url == "http://localhost:8000"
     
-    def test_run_task(self, lettaai_runner, mock_requests):
+    def test_run_task(self, lettaai_runner, mock_client):
         """Test run_task method."""
         with patch('time.sleep'):  # Mock sleep to speed up tests
             result = lettaai_runner.run_task("Test Company")
@@ -53,7 +74,37 @@ class TestLettaAIRunner:
             assert result["token_usage"] > 0
             assert isinstance(result["response_time"], float)
     
-    def test_query_rag_service_success(self, lettaai_runner, mock_requests):
+    def test_run_rag_queries_batch(self, lettaai_runner, mock_client):
+        """Test all aspects are fetched with a single batch request."""
+        results = lettaai_runner._run_rag_queries("Test Company", ("company profile", "latest news"))
+        
+        assert results[0][0]["text"] == "Batched company profile"
+        assert results[1][0]["metadata"]["source"] == "simulated"
+        assert mock_client.post.call_count == 1
+        assert not mock_client.get.called
+    
+    def test_run_rag_queries_batch_unsupported(self, lettaai_runner, mock_client):
+        """Test single queries are used when the batch endpoint is missing."""
+        mock_client.post.return_value.status_code = 404
+        
+        results = lettaai_runner._run_rag_queries("Test Company", ("company profile", "latest news"))
+        
+        assert results[0][0]["text"] == "Test company information"
+        assert mock_client.get.call_count == 2
+        
+        lettaai_runner._run_rag_queries("Other Company", ("company profile", "latest news"))
+        
+        assert mock_client.post.call_count == 1
+    
+    def test_run_rag_queries_batch_malformed(self, lettaai_runner, mock_client):
+        """Test a malformed batch response falls back to placeholder results."""
+        mock_client.post.return_value.content = b"<html>proxy error</html>"
+        
+        results = lettaai_runner._run_rag_queries("Test Company", ("company profile", "latest news"))
+        
+        assert all(r[0]["metadata"]["source"] == "simulated" for r in results)
+    
+    def test_query_rag_service_success(self, lettaai_runner, mock_client):
         """Test _query_rag_service method with successful response."""
         results = lettaai_runner._query_rag_service("Test Company", "company information")
         
@@ -62,14 +113,22 @@ class TestLettaAIRunner:
         assert results[0]["metadata"] == {"source": "test"}
         assert results[0]["score"] == 0.95
         
-        mock_requests.get.assert_called_once_with(
+        mock_client.get.assert_called_once_with(
             "http://localhost:8000/query",
             params={"q": "Test Company company information", "top_k": 3}
         )
     
+    def test_query_rag_service_cached(self, lettaai_runner, mock_client):
+        """Test repeated _query_rag_service calls are served from the cache."""
+        first = lettaai_runner._query_rag_service("Test Company", "company information")
+        second = lettaai_runner._query_rag_service(" test company ", "company information")
+        
+        assert second == first
+        assert mock_client.get.call_count == 1
+    
     def test_query_rag_service_error(self, lettaai_runner):
         """Test _query_rag_service method with error response."""
-        with patch('agents.lettaai.runner.requests.get') as mock_get:
+        with patch.object(lettaai_runner._client, 'get', new_callable=AsyncMock) as mock_get:
             mock_get.side_effect = Exception("Test error")
             
             results = lettaai_runner._query_rag_service("Test Company", "company information")
@@ -78,6 +137,17 @@ class TestLettaAIRunner:
             assert "Test Company" in results[0]["text"]
             assert results[0]["metadata"]["source"] == "simulated"
     
+    def test_query_rag_service_circuit_breaker(self, lettaai_runner):
+        """Test the RAG service is skipped after repeated failures."""
+        with patch.object(lettaai_runner._client, 'get', new_callable=AsyncMock) as mock_get:
+            mock_get.side_effect = Exception("Test error")
+            
+            for _ in range(5):
+                results = lettaai_runner._query_rag_service("Test Company", "company information")
+            
+            assert results[0]["metadata"]["source"] == "simulated"
+            assert mock_get.call_count == 3
+    
     def test_initialize_memory(self, lettaai_runner):
         """Test _initialize_memory method."""
         with patch('time.sleep'):
@@ -95,13 +165,14 @@ class TestLettaAIRunner:
             with patch.object(lettaai_runner, '_add_step') as mock_add_step:
                 with patch.object(lettaai_runner, '_simulate_planning'):
                     with patch.object(lettaai_runner, '_initialize_memory'):
-                        with patch.object(lettaai_runner, '_research_company_profile'):
-                            with patch.object(lettaai_runner, '_research_company_news'):
-                                with patch.object(lettaai_runner, '_research_company_products'):
-                                    with patch.object(lettaai_runner, '_research_company_financials'):
-                                        with patch.object(lettaai_runner, '_consolidate_memory'):
-                                            with patch.object(lettaai_runner, '_generate_report'):
-                                                lettaai_runner._simulate_memory_augmented_research("Test Company")
+                        with patch.object(lettaai_runner, '_run_rag_queries', return_value=[[], [], [], []]):
+                            with patch.object(lettaai_runner, '_research_company_profile'):
+                                with patch.object(lettaai_runner, '_research_company_news'):
+                                    with patch.object(lettaai_runner, '_research_company_products'):
+                                        with patch.object(lettaai_runner, '_research_company_financials'):
+                                            with patch.object(lettaai_runner, '_consolidate_memory'):
+                                                with patch.object(lettaai_runner, '_generate_report'):
+                                                    lettaai_runner._simulate_memory_augmented_research("Test Company")
                 
                 assert True
     
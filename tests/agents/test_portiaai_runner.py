@@ -3,24 +3,37 @@ Unit tests for the Portia AI runner.
 """
 
 import os
+import sys
 import json
 import time
 import pytest
-from unittest.mock import patch, MagicMock
+import subprocess
+from pathlib import Path
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 
 from agents.portiaai.runner import PortiaAIRunner
+from agents.common.circuit_breaker import rag_breaker
 
 class TestPortiaAIRunner:
     """Test cases for the Portia AI runner."""
     
+    @pytest.fixture(autouse=True)
+    def clear_rag_cache(self):
+        """Start every test with an empty RAG result cache and a closed circuit breaker."""
+        PortiaAIRunner.clear_cache()
+        rag_breaker.reset()
+        yield
+        PortiaAIRunner.clear_cache()
+        rag_breaker.reset()
+    
     @pytest.fixture
-    def mock_requests(self):
-        """Mock requests module for testing."""
-        with patch('agents.portiaai.runner.requests') as mock_requests:
+    def mock_client(self, portiaai_runner):
+        """Mock the runner's async HTTP client for testing."""
+        with patch.object(portiaai_runner, '_client') as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
+            mock_response.content = json.dumps({
                 "results": [
                     {
                         "chunk": "Test company information",
@@ -28,21 +41,50 @@ class TestPortiaAIRunner:
                         "score": 0.95
                     }
                 ]
-            }
-            mock_requests.get.return_value = mock_response
-            yield mock_requests
+            }).encode()
+            mock_client.get = AsyncMock(return_value=mock_response)
+            
+            mock_batch_response = MagicMock()
+            mock_batch_response.status_code = 200
+            mock_batch_response.content = json.dumps({
+                "responses": [
+                    {"query": "Test Company company profile", "results": [
+                        {"chunk": "Batched company profile", "metadata": {"source": "test"}, "score": 0.9}
+                    ]}
+                ]
+            }).encode()
+            mock_client.post = AsyncMock(return_value=mock_batch_response)
+            yield mock_client
     
     @pytest.fixture
     def portiaai_runner(self):
         """Create a Portia AI runner instance for testing."""
         return PortiaAIRunner("http://localhost:8000")
     
+    def test_portia_worker_timeout(self, portiaai_runner):
+        """Test a Portia worker that never answers is killed after the timeout."""
+        popen = subprocess.Popen
+        workers = []
+        
+        def hanging_worker(args, **kwargs):
+            workers.append(popen([sys.executable, "-c", "import time; time.sleep(30)"], **kwargs))
+            return workers[-1]
+        
+        with patch('agents.portiaai.runner.PORTIA_VENV_PATH', Path("venv")), \
+             patch('agents.portiaai.runner.PORTIA_WORKER_TIMEOUT', 0.2), \
+             patch('agents.portiaai.runner.subprocess.Popen', side_effect=hanging_worker):
+            with pytest.raises(TimeoutError):
+                portiaai_runner._call_portia_worker({"op": "build_kg", "company": "Test Company"})
+        
+        assert portiaai_runner._portia_worker is None
+        assert workers[0].wait(timeout=5) is not None
+    
     def test_initialization(self, portiaai_runner):
         """Test Portia AI runner initialization."""
         assert portiaai_runner.agent_name == "portiaai"
         assert portiaai_runner.rag_service_url == "http://localhost:8000"
     
-    def test_run_task(self, portiaai_runner, mock_requests):
+    def test_run_task(self, portiaai_runner, mock_client):
         """Test run_task method."""
         with patch('time.sleep'):  # Mock sleep to speed up tests
             result = portiaai_runner.run_task("Test Company")
@@ -53,7 +95,38 @@ class TestPortiaAIRunner:
             assert result["token_usage"] > 0
             assert isinstance(result["response_time"], float)
     
-    def test_query_rag_service_success(self, portiaai_runner, mock_requests):
+    def test_run_rag_queries_batch(self, portiaai_runner, mock_client):
+        """Test all aspects are fetched with a single batch request."""
+        results = portiaai_runner._run_rag_queries("Test Company", ("company profile", "recent news"))
+        
+        assert results[0][0]["text"] == "Batched company profile"
+        assert results[1][0]["metadata"]["source"] == "simulated"
+        assert mock_client.post.call_count == 1
+        assert not mock_client.get.called
+    
+    def test_run_rag_queries_batch_unsupported(self, portiaai_runner, mock_client):
+        """Test single queries are used when the batch endpoint is missing."""
+        mock_client.post.return_value.status_code = 404
+        
+        results = portiaai_runner._run_rag_queries("Test Company", ("company profile", "recent news"))
+        
+        assert results[0][0]["text"] == "Test company information"
+        assert mock_client.get.call_count == 2
+        
+        portiaai_runner._run_rag_queries("Other Company", ("company profile", "recent news"))
+        
+        assert mock_client.post.call_count == 1
+    
+    def test_run_rag_queries_batch_malformed(self, portiaai_runner, mock_client):
+        """Test a malformed batch response falls back to placeholder results."""
+        mock_client.post.return_value.content = b"<html>proxy error</html>"
+        
+        results = portiaai_runner._run_rag_queries("Test Company", ("company profile", "recent news"))
+        
+        assert all(r[0]["metadata"]["source"] == "simulated" for r in results)
+        assert portiaai_runner.token_usage == 0
+    
+    def test_query_rag_service_success(self, portiaai_runner, mock_client):
         """Test _query_rag_service method with successful response."""
         results = portiaai_runner._query_rag_service("Test Company", "company profile")
         
@@ -62,14 +135,22 @@ class TestPortiaAIRunner:
         assert results[0]["metadata"] == {"source": "test"}
         assert results[0]["score"] == 0.95
         
-        mock_requests.get.assert_called_once_with(
+        mock_client.get.assert_called_once_with(
             "http://localhost:8000/query",
             params={"q": "Test Company company profile", "top_k": 3}
         )
     
+    def test_query_rag_service_cached(self, portiaai_runner, mock_client):
+        """Test repeated _query_rag_service calls are served from the cache."""
+        first = portiaai_runner._query_rag_service("Test Company", "company profile")
+        second = portiaai_runner._query_rag_service(" test company ", "company profile")
+        
+        assert second == first
+        assert mock_client.get.call_count == 1
+    
     def test_query_rag_service_error(self, portiaai_runner):
         """Test _query_rag_service method with error response."""
-        with patch('agents.portiaai.runner.requests.get') as mock_get:
+        with patch.object(portiaai_runner._client, 'get', new_callable=AsyncMock) as mock_get:
             mock_get.side_effect = Exception("Test error")
             
             results = portiaai_runner._query_rag_service("Test Company", "company profile")
@@ -78,6 +159,17 @@ class TestPortiaAIRunner:
             assert "Test Company" in results[0]["text"]
             assert results[0]["metadata"]["source"] == "simulated"
     
+    def test_query_rag_service_circuit_breaker(self, portiaai_runner):
+        """Test the RAG service is skipped after repeated failures."""
+        with patch.object(portiaai_runner._client, 'get', new_callable=AsyncMock) as mock_get:
+            mock_get.side_effect = Exception("Test error")
+            
+            for _ in range(5):
+                results = portiaai_runner._query_rag_service("Test Company", "company profile")
+            
+            assert results[0]["metadata"]["source"] == "simulated"
+            assert mock_get.call_count == 3
+    
     def test_generate_placeholder_results(self, portiaai_runner):
         """Test _generate_placeholder_results method."""
         company = "Test Company"
@@ -100,7 +192,7 @@ class TestPortiaAIRunner:
     def test_simulate_knowledge_graph_analysis(self, portiaai_runner):
         """Test _simulate_knowledge_graph_analysis method."""
         with patch('time.sleep'):
-            with patch.object(portiaai_runner, '_add_step') as mock_add_step:
+            with patch.object(portiaai_runner, '_add_steps_bulk') as mock_add_steps_bulk:
                 company_info = [{"text": "Test company info"}]
                 news_info = [{"text": "Test news"}]
                 product_info = [{"text": "Test products"}]
@@ -114,7 +206,11 @@ class TestPortiaAIRunner:
                     market_info
                 )
                 
-                assert mock_add_step.call_count == 5
+                mock_add_steps_bulk.assert_called_once()
+                steps = mock_add_steps_bulk.call_args[0][0]
+                assert len(steps) == 5
+                assert [step_type for step_type, _ in steps] == ["knowledge_graph"] + ["analysis"] * 4
+                assert "Test Company" in steps[0][1]["thought"]
     
     def test_generate_report(self, portiaai_runner):
         """Test _generate_report method."""
@@ -6,21 +6,31 @@ import os
 import json
 import time
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 
 from agents.squidai.runner import SquidAIRunner
+from agents.common.circuit_breaker import rag_breaker
 
 class TestSquidAIRunner:
     """Test cases for the SquidAI runner."""
     
+    @pytest.fixture(autouse=True)
+    def clear_rag_cache(self):
+        """Start every test with an empty RAG result cache and a closed circuit breaker."""
+        SquidAIRunner.clear_cache()
+        rag_breaker.reset()
+        yield
+        SquidAIRunner.clear_cache()
+        rag_breaker.reset()
+    
     @pytest.fixture
-    def mock_requests(self):
-        """Mock requests module for testing."""
-        with patch('agents.squidai.runner.requests') as mock_requests:
+    def mock_client(self, squidai_runner):
+        """Mock the runner's async HTTP client for testing."""
+        with patch.object(squidai_runner, '_client') as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
+            mock_response.content = json.dumps({
                 "results": [
                     {
                         "chunk": "Test company information",
@@ -28,9 +38,20 @@ class TestSquidAIRunner:
                         "score": 0.95
                     }
                 ]
-            }
-            mock_requests.get.return_value = mock_response
-            yield mock_requests
+            }).encode()
+            mock_client.get = AsyncMock(return_value=mock_response)
+            
+            mock_batch_response = MagicMock()
+            mock_batch_response.status_code = 200
+            mock_batch_response.content = json.dumps({
+                "responses": [
+                    {"query": "Test Company company overview", "results": [
+                        {"chunk": "Batched company overview", "metadata": {"source": "test"}, "score": 0.9}
+                    ]}
+                ]
+            }).encode()
+            mock_client.post = AsyncMock(return_value=mock_batch_response)
+            yield mock_client
     
     @pytest.fixture
     def squidai_runner(self):
@@ -42,7 +63,7 @@ class TestSquidAIRunner:
         assert squidai_runner.agent_name == "squidai"
         assert squidai_runner.rag_service_url == "http://localhost:8000"
     
-    def test_run_task(self, squidai_runner, mock_requests):
+    def test_run_task(self, squidai_runner, mock_client):
         """Test run_task method."""
         with patch('time.sleep'):  # Mock sleep to speed up tests
             result = squidai_runner.run_task("Test Company")
@@ -53,7 +74,16 @@ class TestSquidAIRunner:
             assert result["token_usage"] > 0
             assert isinstance(result["response_time"], float)
     
-    def test_query_rag_service_success(self, squidai_runner, mock_requests):
+    def test_run_rag_queries_batch(self, squidai_runner, mock_client):
+        """Test all aspects are fetched with a single batch request."""
+        results = squidai_runner._run_rag_queries("Test Company", ("company overview", "latest news"))
+        
+        assert results[0][0]["text"] == "Batched company overview"
+        assert results[1][0]["metadata"]["source"] == "simulated"
+        assert mock_client.post.call_count == 1
+        assert not mock_client.get.called
+    
+    def test_query_rag_service_success(self, squidai_runner, mock_client):
         """Test _query_rag_service method with successful response."""
         results = squidai_runner._query_rag_service("Test Company", "company information")
         
@@ -62,14 +92,14 @@ class TestSquidAIRunner:
         assert results[0]["metadata"] == {"source": "test"}
         assert results[0]["score"] == 0.95
         
-        mock_requests.get.assert_called_once_with(
+        mock_client.get.assert_called_once_with(
             "http://localhost:8000/query",
             params={"q": "Test Company company information", "top_k": 3}
         )
     
     def test_query_rag_service_error(self, squidai_runner):
         """Test _query_rag_service method with error response."""
-        with patch('agents.squidai.runner.requests.get') as mock_get:
+        with patch.object(squidai_runner._client, 'get', new_callable=AsyncMock) as mock_get:
             mock_get.side_effect = Exception("Test error")
             
             results = squidai_runner._query_rag_service("Test Company", "company information")
@@ -83,8 +113,8 @@ class TestSquidAIRunner:
         with patch('time.sleep'):
             with patch.object(squidai_runner, '_add_step') as mock_add_step:
                 with patch.object(squidai_runner, '_simulate_planning'):
-                    with patch.object(squidai_runner, '_execute_tool') as mock_execute_tool:
-                        mock_execute_tool.return_value = [{"text": "Test data"}]
+                    with patch.object(squidai_runner, '_execute_tools') as mock_execute_tools:
+                        mock_execute_tools.return_value = [[{"text": "Test data"}]] * 4
                         with patch.object(squidai_runner, '_simulate_analysis'):
                             with patch.object(squidai_runner, '_generate_report'):
                                 squidai_runner._simulate_tool_based_research("Test Company")
@@ -39,6 +39,16 @@ from agents.lettaai.runner import LettaAIRunner
 
 load_dotenv()
 
+# Runners are constructed on first use so unevaluated frameworks cost nothing
+RUNNER_FACTORIES = {
+    "crewai": CrewAIRunner,
+    "autogen": AutoGenRunner,
+    "langgraph": LangGraphRunner,
+    "googleadk": GoogleADKRunner,
+    "squidai": SquidAIRunner,
+    "lettaai": LettaAIRunner
+}
+
 try:
     nltk.data.find('tokenizers/punkt')
 except LookupError:
@@ -66,33 +76,35 @@ class AgentEvaluator:
         """
         self.rag_service_url = rag_service_url
         self.output_format = output_format
-        self.agent_runners = self._initialize_agent_runners()
+        self.agent_runners: Dict[str, Any] = {}
         self.vectorizer = TfidfVectorizer(stop_words='english')
         self.sentiment_analyzer = SentimentIntensityAnalyzer()
         
-    def _initialize_agent_runners(self) -> Dict[str, Any]:
+    def _get_agent_runner(self, agent_name: str) -> Any:
         """
-        Initialize all agent runners.
+        Get the runner for an agent framework, creating it on first use.
         
+        Args:
+            agent_name: Name of the agent framework
+            
         Returns:
-            Dictionary of agent runners
+            Agent runner instance
         """
-        return {
-            "crewai": CrewAIRunner(self.rag_service_url),
-            "autogen": AutoGenRunner(self.rag_service_url),
-            "langgraph": LangGraphRunner(self.rag_service_url),
-            "googleadk": GoogleADKRunner(self.rag_service_url),
-            "squidai": SquidAIRunner(self.rag_service_url),
-            "lettaai": LettaAIRunner(self.rag_service_url)
-        }
+        runner = self.agent_runners.get(agent_name)
+        if runner is None:
+            runner = RUNNER_FACTORIES[agent_name](self.rag_service_url)
+            self.agent_runners[agent_name] = runner
+        return runner
     
-    def run_evaluation(self, company_name: str, output_path: str) -> Dict[str, Dict[str, Any]]:
+    def run_evaluation(self, company_name: str, output_path: str,
+                       agent_names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
         """
-        Run evaluation for all agent frameworks.
+        Run evaluation for the selected agent frameworks.
         
         Args:
             company_name: Company name to research
             output_path: Path to save evaluation results
+            agent_names: Frameworks to evaluate (defaults to all)
             
         Returns:
             Dictionary of evaluation results
@@ -101,7 +113,8 @@ class AgentEvaluator:
         
         results = {}
         
-        for agent_name, runner in self.agent_runners.items():
+        for agent_name in agent_names or RUNNER_FACTORIES:
+            runner = self._get_agent_runner(agent_name)
             logger.info(f"Running {agent_name} agent for {company_name}...")
             
             start_time = time.time()
@@ -350,13 +363,21 @@ def main():
     parser.add_argument("--company", type=str, default="Microsoft Corporation", help="Company name to research")
     parser.add_argument("--output", type=str, default="../data/evaluation_results", help="Path to save evaluation results")
     parser.add_argument("--format", type=str, choices=["json", "csv"], default="json", help="Output format (json or csv)")
+    parser.add_argument("--frameworks", type=str, default=None, help="Comma-separated list of frameworks to evaluate (default: all)")
     args = parser.parse_args()
     
+    frameworks = None
+    if args.frameworks:
+        frameworks = [name.strip() for name in args.frameworks.split(",") if name.strip()]
+        unknown = [name for name in frameworks if name not in RUNNER_FACTORIES]
+        if unknown:
+            parser.error(f"unknown frameworks: {', '.join(unknown)} (choose from {', '.join(RUNNER_FACTORIES)})")
+    
     rag_service_url = f"http://{os.getenv('RAG_SERVICE_HOST', 'localhost')}:{os.getenv('RAG_SERVICE_PORT', '8000')}"
     
     evaluator = AgentEvaluator(rag_service_url, args.format)
     
-    results = evaluator.run_evaluation(args.company, args.output)
+    results = evaluator.run_evaluation(args.company, args.output, frameworks)
     
     print("\nEvaluation Summary:")
     print("------------------")
@@ -76,3 +76,19 @@ def test_query_empty_store():
     response = fresh_client.get("/query?q=test%20query")
     assert response.status_code == 400
     assert "Vector store is empty" in response.json()["detail"]
+
+def test_query_batch_invalid_top_k():
+    """Test batch queries reject out-of-range top_k values."""
+    response = client.post("/query_batch", json={"queries": [{"q": "a", "top_k": 0}]})
+    assert response.status_code == 422
+    
+    response = client.post("/query_batch", json={"queries": [{"q": "a"}, {"q": "b", "top_k": -1}]})
+    assert response.status_code == 422
+
+def test_query_batch_too_many_queries():
+    """Test batch queries reject oversized batches."""
+    import rag_service.app.api as api_module
+    
+    queries = [{"q": "test"}] * (api_module.MAX_BATCH_QUERIES + 1)
+    response = client.post("/query_batch", json={"queries": queries})
+    assert response.status_code == 422